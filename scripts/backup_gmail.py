@@ -20,11 +20,6 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from mcp_google_services.utils.config import Config
-from mcp_google_services.core.auth import AuthManager
-from mcp_google_services.services.gmail.api import GmailAPI
-from mcp_google_services.services.gmail.backup import GmailBackup
-
 
 def main():
     """Main backup execution."""
@@ -84,6 +79,13 @@ Examples:
     
     args = parser.parse_args()
     
+    # Imported after argument parsing so --help and usage errors don't pay
+    # for loading the Google client libraries
+    from mcp_google_services.utils.config import Config
+    from mcp_google_services.core.auth import AuthManager
+    from mcp_google_services.services.gmail.api import GmailAPI
+    from mcp_google_services.services.gmail.backup import GmailBackup
+    
     # Initialize configuration
     config_path = Path(args.config) if args.config else None
     config = Config(config_path=config_path)
@@ -125,7 +127,7 @@ Examples:
             print(f"   Messages backed up: {result.message_count}")
             print(f"   Messages processed: {result.messages_processed}")
             print(f"   Messages failed: {result.messages_failed}")
-            print(f"   Backup path: {result.backup_path}")
+            print(f"   Backup path: {result.backup_path or 'none (no new messages)'}")
             print(f"   Duration: {duration:.1f} seconds")
             sys.exit(0)
         else:
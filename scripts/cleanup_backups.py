@@ -13,89 +13,189 @@ Environment Variables:
     BACKUP_RETENTION_COUNT: Keep last N backups (default: 10)
 """
 
+import os
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from mcp_google_services.utils.config import Config
 
+# Folders with at least this many backups are stat'ed from a thread pool
+PARALLEL_STAT_THRESHOLD = 64
 
-def get_backup_files(backup_folder: Path) -> List[Tuple[Path, datetime]]:
-    """Get all backup files with their modification times.
+
+def get_backup_files(backup_folder: Path) -> List[Tuple[Path, float, int]]:
+    """Get all backup files with their modification times and sizes.
+    
+    Uses os.scandir so each file is stat'ed once; callers should use the
+    returned size instead of calling stat() again, and pass the list to the
+    cleanup functions rather than scanning the folder again.
     
     Args:
         backup_folder: Path to backup folder
         
     Returns:
-        List of tuples (file_path, modification_time) sorted by time (oldest first)
+        List of tuples (file_path, mtime_epoch_seconds, size_bytes) sorted by time (oldest first)
     """
-    backup_files = []
+    try:
+        with os.scandir(backup_folder) as entries:
+            mbox_entries = [
+                entry for entry in entries
+                if entry.name.endswith(".mbox") and entry.is_file(follow_symlinks=False)
+            ]
+    except FileNotFoundError:
+        return []
     
-    if not backup_folder.exists():
-        return backup_files
+    # On network filesystems each stat() is a round-trip; keep many in flight
+    if len(mbox_entries) >= PARALLEL_STAT_THRESHOLD:
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            stats = list(executor.map(os.DirEntry.stat, mbox_entries))
+    else:
+        stats = [entry.stat() for entry in mbox_entries]
     
-    for file_path in backup_folder.glob("*.mbox"):
-        if file_path.is_file():
-            mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
-            backup_files.append((file_path, mtime))
+    backup_files = [
+        (Path(entry.path), st.st_mtime, st.st_size)
+        for entry, st in zip(mbox_entries, stats)
+    ]
     
     # Sort by modification time (oldest first)
     backup_files.sort(key=lambda x: x[1])
     return backup_files
 
 
-def cleanup_by_days(backup_folder: Path, keep_days: int, dry_run: bool = False) -> Tuple[int, int]:
-    """Remove backups older than specified days.
+def _write_lines(lines: List[str]) -> None:
+    """Write report lines to stdout in a single call.
     
     Args:
-        backup_folder: Path to backup folder
-        keep_days: Keep backups newer than this many days
-        dry_run: If True, only report what would be deleted
+        lines: Lines to write (without trailing newlines)
+    """
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _safe_unlink(file_path: Path) -> Optional[Exception]:
+    """Delete a backup file and its .ids message ID log, returning the error instead of raising.
+    
+    Args:
+        file_path: Path to file to delete
+        
+    Returns:
+        None on success, otherwise the exception raised by unlink()
+    """
+    try:
+        file_path.unlink()
+    except Exception as e:
+        return e
+    
+    # Full backups (and backups from before ID logs existed) have no .ids file
+    try:
+        file_path.with_suffix(".ids").unlink()
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        return e
+    return None
+
+
+def delete_files(files_to_delete: List[Tuple[Path, float, int]]) -> Tuple[int, int]:
+    """Delete backup files concurrently.
+    
+    unlink() releases the GIL, so a thread pool overlaps the syscalls when
+    removing many backups. Results are reported from the calling thread in
+    the original order to keep output readable.
+    
+    Args:
+        files_to_delete: List of tuples (file_path, mtime_epoch_seconds, size_bytes)
         
     Returns:
         Tuple of (files_deleted, space_freed_bytes)
     """
-    cutoff_date = datetime.now() - timedelta(days=keep_days)
-    backup_files = get_backup_files(backup_folder)
+    if not files_to_delete:
+        return 0, 0
     
     files_deleted = 0
     space_freed = 0
+    lines = []
     
-    for file_path, mtime in backup_files:
-        if mtime < cutoff_date:
-            file_size = file_path.stat().st_size
-            if dry_run:
-                print(f"Would delete: {file_path.name} ({file_size:,} bytes, {mtime.strftime('%Y-%m-%d %H:%M:%S')})")
+    with ThreadPoolExecutor(max_workers=min(32, len(files_to_delete))) as executor:
+        errors = executor.map(_safe_unlink, [file_path for file_path, _, _ in files_to_delete])
+        for (file_path, _, file_size), error in zip(files_to_delete, errors):
+            if error is None:
+                lines.append(f"Deleted: {file_path.name} ({file_size:,} bytes)")
+                files_deleted += 1
+                space_freed += file_size
             else:
-                try:
-                    file_path.unlink()
-                    print(f"Deleted: {file_path.name} ({file_size:,} bytes)")
-                    files_deleted += 1
-                    space_freed += file_size
-                except Exception as e:
-                    print(f"Error deleting {file_path.name}: {e}")
+                lines.append(f"Error deleting {file_path.name}: {error}")
     
+    _write_lines(lines)
     return files_deleted, space_freed
 
 
-def cleanup_by_count(backup_folder: Path, keep_count: int, dry_run: bool = False) -> Tuple[int, int]:
+def report_dry_run(files_to_delete: List[Tuple[Path, float, int]]) -> None:
+    """Print the files a dry run would delete.
+    
+    Args:
+        files_to_delete: List of tuples (file_path, mtime_epoch_seconds, size_bytes)
+    """
+    _write_lines([
+        f"Would delete: {file_path.name} ({file_size:,} bytes, "
+        f"{datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')})"
+        for file_path, mtime, file_size in files_to_delete
+    ])
+
+
+def cleanup_by_days(
+    backup_files: List[Tuple[Path, float, int]],
+    keep_days: int,
+    dry_run: bool = False,
+) -> Tuple[int, int]:
+    """Remove backups older than specified days.
+    
+    Args:
+        backup_files: Backups from get_backup_files (sorted oldest first)
+        keep_days: Keep backups newer than this many days
+        dry_run: If True, only report what would be deleted
+        
+    Returns:
+        Tuple of (files_deleted, space_freed_bytes)
+    """
+    cutoff_ts = (datetime.now() - timedelta(days=keep_days)).timestamp()
+    
+    # Files are sorted oldest first, so stop at the first one inside the window
+    files_to_delete = []
+    for backup_file in backup_files:
+        if backup_file[1] >= cutoff_ts:
+            break
+        files_to_delete.append(backup_file)
+    
+    if dry_run:
+        report_dry_run(files_to_delete)
+        return 0, 0
+    
+    return delete_files(files_to_delete)
+
+
+def cleanup_by_count(
+    backup_files: List[Tuple[Path, float, int]],
+    keep_count: int,
+    dry_run: bool = False,
+) -> Tuple[int, int]:
     """Keep only the most recent N backups.
     
     Args:
-        backup_folder: Path to backup folder
+        backup_files: Backups from get_backup_files (sorted oldest first)
         keep_count: Number of most recent backups to keep
         dry_run: If True, only report what would be deleted
         
     Returns:
         Tuple of (files_deleted, space_freed_bytes)
     """
-    backup_files = get_backup_files(backup_folder)
-    
     if len(backup_files) <= keep_count:
         if dry_run:
             print(f"Would keep all {len(backup_files)} backups (limit: {keep_count})")
@@ -104,23 +204,53 @@ def cleanup_by_count(backup_folder: Path, keep_count: int, dry_run: bool = False
     # Files to delete (all except the last keep_count)
     files_to_delete = backup_files[:-keep_count]
     
-    files_deleted = 0
-    space_freed = 0
+    if dry_run:
+        report_dry_run(files_to_delete)
+        return 0, 0
     
-    for file_path, mtime in files_to_delete:
-        file_size = file_path.stat().st_size
-        if dry_run:
-            print(f"Would delete: {file_path.name} ({file_size:,} bytes, {mtime.strftime('%Y-%m-%d %H:%M:%S')})")
-        else:
-            try:
-                file_path.unlink()
-                print(f"Deleted: {file_path.name} ({file_size:,} bytes)")
-                files_deleted += 1
-                space_freed += file_size
-            except Exception as e:
-                print(f"Error deleting {file_path.name}: {e}")
+    return delete_files(files_to_delete)
+
+
+def cleanup_combined(
+    backup_files: List[Tuple[Path, float, int]],
+    keep_days: Optional[int],
+    keep_count: Optional[int],
+    dry_run: bool = False,
+) -> Tuple[int, int]:
+    """Apply the days and count retention policies in a single pass.
     
-    return files_deleted, space_freed
+    A backup is deleted if it is older than keep_days OR falls outside the
+    keep_count most recent backups. Each file is considered once, even if
+    it matches both rules.
+    
+    Args:
+        backup_files: Backups from get_backup_files (sorted oldest first)
+        keep_days: Keep backups newer than this many days (None/0 disables)
+        keep_count: Number of most recent backups to keep (None/0 disables)
+        dry_run: If True, only report what would be deleted
+        
+    Returns:
+        Tuple of (files_deleted, space_freed_bytes)
+    """
+    cutoff_ts = (datetime.now() - timedelta(days=keep_days)).timestamp() if keep_days else None
+    count_limit = max(len(backup_files) - keep_count, 0) if keep_count else 0
+    
+    files_to_delete = [
+        backup_file
+        for index, backup_file in enumerate(backup_files)
+        if index < count_limit or (cutoff_ts is not None and backup_file[1] < cutoff_ts)
+    ]
+    
+    if dry_run:
+        if not files_to_delete:
+            print(f"Would keep all {len(backup_files)} backups")
+        report_dry_run(files_to_delete)
+        return 0, 0
+    
+    return delete_files(files_to_delete)
+
+
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
 
 
 def format_bytes(bytes_value: int) -> str:
@@ -132,11 +262,12 @@ def format_bytes(bytes_value: int) -> str:
     Returns:
         Formatted string (e.g., "1.5 MB")
     """
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if bytes_value < 1024.0:
-            return f"{bytes_value:.1f} {unit}"
-        bytes_value /= 1024.0
-    return f"{bytes_value:.1f} PB"
+    if bytes_value < 1024:
+        return f"{bytes_value} B"
+    
+    # Pick the unit directly from the bit length (each unit is 2**10 larger)
+    exponent = min((int(bytes_value).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{bytes_value / (1 << (exponent * 10)):.1f} {_BYTE_UNITS[exponent]}"
 
 
 def main():
@@ -212,24 +343,15 @@ Examples:
     
     # Get current backup files
     backup_files = get_backup_files(backup_folder)
-    total_size = sum(f.stat().st_size for f, _ in backup_files)
+    total_size = sum(size for _, _, size in backup_files)
     
     print(f"📦 Current backups: {len(backup_files)} files, {format_bytes(total_size)}")
     print()
     
-    # Apply retention policies
-    files_deleted = 0
-    space_freed = 0
-    
-    if keep_days:
-        deleted, freed = cleanup_by_days(backup_folder, keep_days, args.dry_run)
-        files_deleted += deleted
-        space_freed += freed
-    
-    if keep_count:
-        deleted, freed = cleanup_by_count(backup_folder, keep_count, args.dry_run)
-        files_deleted += deleted
-        space_freed += freed
+    # Apply retention policies to the same scan
+    files_deleted, space_freed = cleanup_combined(
+        backup_files, keep_days, keep_count, args.dry_run
+    )
     
     print()
     if args.dry_run:
@@ -237,10 +359,10 @@ Examples:
     else:
         print(f"✅ Cleanup complete: {files_deleted} files deleted, {format_bytes(space_freed)} freed")
         
-        # Show remaining backups
-        remaining = get_backup_files(backup_folder)
-        remaining_size = sum(f.stat().st_size for f, _ in remaining)
-        print(f"📦 Remaining backups: {len(remaining)} files, {format_bytes(remaining_size)}")
+        # Show remaining backups (derived from the initial scan, no re-walk)
+        remaining_count = len(backup_files) - files_deleted
+        remaining_size = total_size - space_freed
+        print(f"📦 Remaining backups: {remaining_count} files, {format_bytes(remaining_size)}")
 
 
 if __name__ == "__main__":
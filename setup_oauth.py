@@ -5,7 +5,9 @@ Quick setup script to help create OAuth credentials for Gmail API.
 This script guides you through the OAuth setup process.
 """
 
+import os
 import json
+import shutil
 import webbrowser
 from pathlib import Path
 
@@ -14,6 +16,20 @@ def print_step(step_num, description):
     print(f"STEP {step_num}: {description}")
     print('='*60)
 
+def install_credentials_file(source, destination):
+    """Copy the downloaded credentials file to the destination path.
+
+    The copy is written under a temporary name and renamed into place, so an
+    existing credentials file is replaced atomically and the download is kept.
+    """
+    tmp_path = destination.with_name(destination.name + ".tmp")
+    try:
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, destination)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
 def main():
     print("""
 ╔══════════════════════════════════════════════════════════╗
@@ -130,7 +146,14 @@ Time required: ~3-5 minutes
         # Try searching in Downloads folder
         downloads_dir = Path.home() / "Downloads"
         if downloads_dir.exists():
-            matching_files = list(downloads_dir.glob("*client_secret*.json"))
+            with os.scandir(downloads_dir) as entries:
+                matching_files = [
+                    Path(entry.path)
+                    for entry in entries
+                    if "client_secret" in entry.name
+                    and entry.name.endswith(".json")
+                    and entry.is_file(follow_symlinks=False)
+                ]
             if matching_files:
                 print(f"\nFound {len(matching_files)} potential credential file(s) in Downloads:")
                 for i, f in enumerate(matching_files, 1):
@@ -155,8 +178,7 @@ Time required: ~3-5 minutes
             return
     
     # Copy to config directory
-    import shutil
-    shutil.copy(downloaded_path, credentials_path)
+    install_credentials_file(downloaded_path, credentials_path)
     print(f"\n✅ Credentials file copied to: {credentials_path}")
     
     # Verify it's valid JSON
@@ -1,19 +1,100 @@
 """Authentication management for Google Services MCP Server."""
 
 import os
-import json
-import subprocess
+import asyncio
+import base64
+import hashlib
+import operator
+import threading
+import weakref
+import zlib
+from functools import cached_property, lru_cache
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set, FrozenSet, Iterable, Tuple
 
+import requests
+from requests.adapters import HTTPAdapter
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google.auth import default as google_auth_default
 from google.auth.exceptions import DefaultCredentialsError, RefreshError
-from google_auth_oauthlib.flow import InstalledAppFlow
-import keyring
 
 from ..utils.config import Config
+from ..utils import json_codec
+
+
+# Broader scopes that also satisfy a request for the key scope, so a token
+# granted gmail.readonly can serve a metadata-only caller without re-consent
+_IMPLIED_BY_SCOPES: Dict[str, frozenset] = {
+    "https://www.googleapis.com/auth/gmail.metadata": frozenset([
+        "https://www.googleapis.com/auth/gmail.readonly",
+        "https://www.googleapis.com/auth/gmail.modify",
+        "https://mail.google.com/",
+    ]),
+}
+
+# Bit per known scope so the common scope checks are integer ANDs
+_SCOPE_BITS: Dict[str, int] = {
+    scope: 1 << bit
+    for bit, scope in enumerate([
+        "https://www.googleapis.com/auth/gmail.readonly",
+        "https://www.googleapis.com/auth/gmail.send",
+        "https://www.googleapis.com/auth/gmail.metadata",
+        "https://www.googleapis.com/auth/gmail.modify",
+        "https://www.googleapis.com/auth/gmail.compose",
+        "https://www.googleapis.com/auth/gmail.labels",
+        "https://mail.google.com/",
+        "https://www.googleapis.com/auth/drive",
+        "https://www.googleapis.com/auth/drive.readonly",
+        "https://www.googleapis.com/auth/calendar",
+        "https://www.googleapis.com/auth/calendar.readonly",
+    ])
+}
+
+# Bits satisfied by holding a scope: its own bit plus every scope it implies
+_GRANTED_SCOPE_BITS: Dict[str, int] = dict(_SCOPE_BITS)
+for _implied, _granting_scopes in _IMPLIED_BY_SCOPES.items():
+    for _scope in _granting_scopes:
+        _GRANTED_SCOPE_BITS[_scope] |= _SCOPE_BITS[_implied]
+del _implied, _granting_scopes, _scope
+
+
+@lru_cache(maxsize=32)
+def _required_scope_mask(required: FrozenSet[str]) -> Optional[int]:
+    """Get the bitmask for a set of required scopes.
+
+    Args:
+        required: Scopes the caller needs
+
+    Returns:
+        Bitmask of the scopes, or None if any scope is not in _SCOPE_BITS
+    """
+    mask = 0
+    for scope in required:
+        bit = _SCOPE_BITS.get(scope)
+        if bit is None:
+            return None
+        mask |= bit
+    return mask
+
+
+# Marks keyring values stored as base64(zlib(json)) rather than plain JSON
+_KEYRING_COMPRESSED_PREFIX = "z1:"
+
+
+@lru_cache(maxsize=4)
+def _load_client_secrets(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse an OAuth client secrets file, once per file version.
+
+    Args:
+        path: Path to the client secrets (credentials.json) file
+        mtime_ns: File modification time; a new value invalidates the cache
+
+    Returns:
+        Parsed client configuration
+    """
+    return json_codec.loads(Path(path).read_bytes())
 
 
 class AuthManager:
@@ -26,6 +107,21 @@ class AuthManager:
         "https://www.googleapis.com/auth/gmail.send",
     ]
 
+    # Default scopes hashed once for the scope checks in get_credentials
+    _GMAIL_SCOPE_SET = frozenset(GMAIL_SCOPES)
+
+    # Credentials attributes persisted by _save_credentials
+    _CRED_ATTRS = ("token", "refresh_token", "token_uri", "client_id", "client_secret", "scopes")
+    _get_cred_values = operator.attrgetter(*_CRED_ATTRS)
+
+    # Refresh tokens this close to expiry in the background so requests never wait on it.
+    # google-auth treats a token as invalid (and get_credentials refreshes it
+    # synchronously) 3m45s before expiry, so the window must start well before that.
+    _PREEMPTIVE_REFRESH_WINDOW = timedelta(minutes=10)
+
+    # Token directories already created in this process (skip repeated mkdir)
+    _dirs_ensured: Set[Path] = set()
+
     def __init__(self, config: Optional[Config] = None):
         """Initialize AuthManager.
 
@@ -35,10 +131,33 @@ class AuthManager:
         self.config = config or Config()
         self.credentials_path = Path(self.config.get("google_apis.credentials_path", "config/credentials.json"))
         self.token_store_path = Path(self.config.get("auth.token_store", "config/tokens.json"))
+        # One token file per user lives next to the configured store (config/tokens/)
+        self.token_store_dir = self.token_store_path.with_suffix("")
         self.keyring_service = "mcp_google_services"
+        # Whether the keyring backend works: None until the first keyring call
+        self._keyring_ok: Optional[bool] = None
+        
+        # Pooled HTTP session reused for token refresh/revoke (keeps TLS connections alive)
+        self._http_session = requests.Session()
+        self._http_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+        self._auth_request = Request(session=self._http_session)
         
-        # Ensure token directory exists
-        self.token_store_path.parent.mkdir(parents=True, exist_ok=True)
+        # In-process credentials cache (user_id -> Credentials) to skip keyring/file reads
+        self._cred_cache: Dict[str, Credentials] = {}
+        self._cred_cache_lock = threading.Lock()
+        # Users with a background refresh in flight (guarded by _cred_cache_lock)
+        self._refreshing: Set[str] = set()
+        # Per-user locks so concurrent callers collapse to a single refresh; an
+        # entry lives only while some caller holds or waits on it
+        self._refresh_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+        # Parsed token files keyed by user_id, tagged with the file's st_mtime_ns
+        self._file_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        
+        # Ensure token directory exists (once per process)
+        if self.token_store_dir not in AuthManager._dirs_ensured:
+            self.token_store_dir.mkdir(parents=True, exist_ok=True)
+            self._migrate_legacy_token_file()
+            AuthManager._dirs_ensured.add(self.token_store_dir)
 
     def get_credentials(self, user_id: str, scopes: Optional[List[str]] = None) -> Credentials:
         """Get authenticated credentials for a user.
@@ -60,54 +179,75 @@ class AuthManager:
             FileNotFoundError: If credentials file doesn't exist and ADC not available
             RefreshError: If token refresh fails
         """
-        scopes = scopes or self.GMAIL_SCOPES
+        if scopes:
+            required = frozenset(scopes)
+        else:
+            scopes = self.GMAIL_SCOPES
+            required = self._GMAIL_SCOPE_SET
+        
+        # Fast path: reuse valid credentials already loaded in this process
+        cached = self._get_cached_credentials(user_id, required)
+        if cached:
+            self._schedule_preemptive_refresh(user_id, cached)
+            return cached
+        
+        # Checked once: the priority branches below all depend on it
+        credentials_file_exists = self.credentials_path.exists()
         
         # Priority 1: If credentials.json exists, use OAuth flow (Gmail API requires OAuth scopes)
         # Gmail API doesn't work with Application Default Credentials (gcloud auth)
         # because ADC doesn't support Gmail scopes
-        if self.credentials_path.exists():
-            # Try to load existing stored OAuth credentials first
-            credentials = self._load_credentials(user_id)
-            
-            if credentials and credentials.valid:
-                # Check if credentials have required scopes
-                existing_scopes = set(credentials.scopes or [])
-                required_scopes = set(scopes)
-                if required_scopes.issubset(existing_scopes):
-                    return credentials
-                else:
-                    # Missing scopes, delete and re-authenticate
-                    import logging
-                    missing_scopes = required_scopes - existing_scopes
-                    logging.info(f"Missing scopes: {missing_scopes}. Re-authenticating...")
-                    self._delete_credentials(user_id)
-            
-            # Try to refresh expired credentials
-            if credentials and credentials.expired and credentials.refresh_token:
-                try:
-                    credentials.refresh(Request())
-                    existing_scopes = set(credentials.scopes or [])
-                    required_scopes = set(scopes)
-                    if required_scopes.issubset(existing_scopes):
-                        self._save_credentials(user_id, credentials)
+        if credentials_file_exists:
+            # One caller per user loads/refreshes at a time; the rest reuse its result
+            with self._refresh_lock_for(user_id):
+                cached = self._get_cached_credentials(user_id, required)
+                if cached:
+                    return cached
+                
+                # Prefer the shared in-process instance so a refresh updates every holder,
+                # then fall back to stored OAuth credentials
+                with self._cred_cache_lock:
+                    credentials = self._cred_cache.get(user_id)
+                if credentials is None:
+                    credentials = self._load_credentials(user_id)
+                
+                if credentials and credentials.valid:
+                    # Check if credentials have required scopes
+                    missing_scopes = self._missing_scopes(required, credentials.scopes)
+                    if not missing_scopes:
+                        self._cache_credentials(user_id, credentials)
+                        self._schedule_preemptive_refresh(user_id, credentials)
                         return credentials
                     else:
+                        # Missing scopes, delete and re-authenticate
+                        import logging
+                        logging.info(f"Missing scopes: {missing_scopes}. Re-authenticating...")
                         self._delete_credentials(user_id)
-                except RefreshError:
-                    pass
-            
-            # No valid credentials or missing scopes - start OAuth flow
-            return self._authenticate_user(user_id, scopes)
+                
+                # Try to refresh expired credentials
+                if credentials and credentials.expired and credentials.refresh_token:
+                    try:
+                        credentials.refresh(self._auth_request)
+                        if not self._missing_scopes(required, credentials.scopes):
+                            self._save_credentials(user_id, credentials)
+                            return credentials
+                        else:
+                            self._delete_credentials(user_id)
+                    except RefreshError:
+                        # Revoked or otherwise unusable: stop sharing this instance so the
+                        # next call reloads from the token store instead of retrying it
+                        self._evict_cached_credentials(user_id)
+                
+                # No valid credentials or missing scopes - start OAuth flow
+                return self._authenticate_user(user_id, scopes)
         
         # Priority 2: Try Application Default Credentials (fallback for non-Gmail APIs)
         try:
-            credentials, project = google_auth_default()
+            credentials, _ = google_auth_default()
             if credentials:
-                existing_scopes = set(getattr(credentials, 'scopes', []) or [])
-                required_scopes = set(scopes)
-                if required_scopes.issubset(existing_scopes):
+                if not self._missing_scopes(required, getattr(credentials, 'scopes', None)):
                     if credentials.expired:
-                        credentials.refresh(Request())
+                        credentials.refresh(self._auth_request)
                     return credentials
                 else:
                     raise FileNotFoundError(
@@ -125,7 +265,7 @@ class AuthManager:
             logging.debug(f"ADC authentication failed: {e}")
         
         # Priority 3: Try OAuth flow with credentials file (if exists)
-        if self.credentials_path.exists():
+        if credentials_file_exists:
             return self._authenticate_user(user_id, scopes)
         
         # Priority 4: Prompt user to run gcloud auth
@@ -140,6 +280,149 @@ class AuthManager:
             "After authentication, the MCP server will automatically use your credentials."
         )
 
+    def _get_cached_credentials(self, user_id: str, required: FrozenSet[str]) -> Optional[Credentials]:
+        """Get in-process cached credentials if still valid for the scopes.
+
+        Args:
+            user_id: User email address
+            required: Scopes the caller needs
+
+        Returns:
+            Cached Credentials, or None on a miss
+        """
+        with self._cred_cache_lock:
+            cached = self._cred_cache.get(user_id)
+        if cached and cached.valid and not self._missing_scopes(required, cached.scopes):
+            return cached
+        return None
+
+    def _cache_credentials(self, user_id: str, credentials: Credentials) -> None:
+        """Store credentials in the in-process cache.
+
+        Args:
+            user_id: User email address
+            credentials: Credentials to cache
+        """
+        with self._cred_cache_lock:
+            self._cred_cache[user_id] = credentials
+
+    def _refresh_lock_for(self, user_id: str) -> threading.Lock:
+        """Get the lock serializing credential loads and refreshes for a user.
+
+        Args:
+            user_id: User email address
+
+        Returns:
+            Lock shared by all concurrent callers for this user (kept only
+            while referenced, so hold it for as long as it is used)
+        """
+        with self._cred_cache_lock:
+            return self._refresh_locks.setdefault(user_id, threading.Lock())
+
+    def _evict_cached_credentials(self, user_id: str) -> None:
+        """Remove a user's credentials from the in-process cache.
+
+        Args:
+            user_id: User email address
+        """
+        with self._cred_cache_lock:
+            self._cred_cache.pop(user_id, None)
+
+    def _schedule_preemptive_refresh(self, user_id: str, credentials: Credentials) -> None:
+        """Start a background refresh if credentials expire within the refresh window.
+
+        The caller keeps using the still-valid token; the refreshed token is
+        saved and served to subsequent calls.
+
+        Args:
+            user_id: User email address
+            credentials: Currently valid credentials for the user
+        """
+        if not credentials.refresh_token or credentials.expiry is None:
+            return
+
+        remaining = credentials.expiry - datetime.now(timezone.utc).replace(tzinfo=None)
+        if not timedelta(0) < remaining < self._PREEMPTIVE_REFRESH_WINDOW:
+            return
+
+        with self._cred_cache_lock:
+            if user_id in self._refreshing:
+                return
+            self._refreshing.add(user_id)
+
+        threading.Thread(
+            target=self._preemptive_refresh,
+            args=(user_id, credentials),
+            daemon=True,
+        ).start()
+
+    def _preemptive_refresh(self, user_id: str, credentials: Credentials) -> None:
+        """Refresh and save credentials (runs in a background thread).
+
+        Args:
+            user_id: User email address
+            credentials: Credentials to refresh in place
+        """
+        try:
+            with self._refresh_lock_for(user_id):
+                credentials.refresh(self._auth_request)
+                self._save_credentials(user_id, credentials)
+        except Exception as e:
+            import logging
+            logging.warning(f"Background token refresh failed for {user_id}: {e}")
+        finally:
+            with self._cred_cache_lock:
+                self._refreshing.discard(user_id)
+
+    @staticmethod
+    def _missing_scopes(required: FrozenSet[str], granted: Optional[Iterable[str]]) -> Set[str]:
+        """Get required scopes not covered by the granted scopes.
+
+        A required scope is covered if it was granted directly or if a broader
+        scope that implies it was granted.
+
+        Args:
+            required: Scopes the caller needs
+            granted: Scopes attached to the credentials
+
+        Returns:
+            Set of missing scopes (empty if all are covered)
+        """
+        # Bitmask fast path when every required scope is a known one
+        required_mask = _required_scope_mask(required)
+        if required_mask is not None:
+            granted_mask = 0
+            for scope in granted or ():
+                granted_mask |= _GRANTED_SCOPE_BITS.get(scope, 0)
+            if granted_mask & required_mask == required_mask:
+                return set()
+        
+        missing = required.difference(granted or ())
+        if not missing:
+            return set()
+
+        granted_set = frozenset(granted or ())
+        return {
+            scope for scope in missing
+            if not (_IMPLIED_BY_SCOPES.get(scope, frozenset()) & granted_set)
+        }
+
+    async def get_credentials_async(self, user_id: str, scopes: Optional[List[str]] = None) -> Credentials:
+        """Async variant of get_credentials.
+
+        Runs the blocking lookup in a worker thread so the event loop is not
+        blocked by keyring calls, token file reads/writes, token refreshes
+        (synchronous requests calls) or a possible OAuth browser flow.
+
+        Args:
+            user_id: User email address or identifier
+            scopes: Optional list of OAuth scopes. Defaults to Gmail scopes.
+
+        Returns:
+            Authenticated Credentials object
+        """
+        return await asyncio.to_thread(self.get_credentials, user_id, scopes)
+
     def _authenticate_user(self, user_id: str, scopes: List[str]) -> Credentials:
         """Perform OAuth 2.0 authentication flow.
 
@@ -156,7 +439,9 @@ class AuthManager:
         Returns:
             Authenticated Credentials object
         """
-        if not self.credentials_path.exists():
+        try:
+            credentials_mtime_ns = self.credentials_path.stat().st_mtime_ns
+        except FileNotFoundError:
             raise FileNotFoundError(
                 f"Credentials file not found: {self.credentials_path}\n"
                 "Please download OAuth 2.0 credentials from Google Cloud Console "
@@ -166,11 +451,13 @@ class AuthManager:
                 "2. Create OAuth client ID (Desktop app)\n"
                 "3. Download JSON and save as config/credentials.json\n"
                 "4. Enable Gmail API in APIs & Services > Library"
-            )
+            ) from None
 
-        flow = InstalledAppFlow.from_client_secrets_file(
-            str(self.credentials_path), scopes
-        )
+        # Imported here: oauthlib is only needed when a browser flow actually runs
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
+        client_config = _load_client_secrets(str(self.credentials_path), credentials_mtime_ns)
+        flow = InstalledAppFlow.from_client_config(client_config, scopes)
         
         # Run local server flow - this will:
         # - Open browser automatically
@@ -217,14 +504,9 @@ class AuthManager:
             user_id: User email address
             credentials: Credentials to save
         """
-        token_data = {
-            "token": credentials.token,
-            "refresh_token": credentials.refresh_token,
-            "token_uri": credentials.token_uri,
-            "client_id": credentials.client_id,
-            "client_secret": credentials.client_secret,
-            "scopes": credentials.scopes,
-        }
+        token_data = dict(zip(self._CRED_ATTRS, self._get_cred_values(credentials)))
+        
+        self._cache_credentials(user_id, credentials)
         
         # Save to keyring (preferred)
         self._save_to_keyring(user_id, token_data)
@@ -232,6 +514,12 @@ class AuthManager:
         # Also save to file as backup
         self._save_to_file(user_id, token_data)
 
+    @cached_property
+    def _keyring(self):
+        """Keyring backend, imported and resolved on first use only."""
+        import keyring
+        return keyring.get_keyring()
+
     def _load_from_keyring(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Load credentials from keyring.
 
@@ -241,10 +529,22 @@ class AuthManager:
         Returns:
             Token data dictionary or None
         """
+        if self._keyring_ok is False:
+            return None
+        
+        from keyring.errors import KeyringError
+        
         try:
-            token_json = keyring.get_password(self.keyring_service, user_id)
+            token_json = self._keyring.get_password(self.keyring_service, user_id)
+            self._keyring_ok = True
             if token_json:
-                return json.loads(token_json)
+                if token_json.startswith(_KEYRING_COMPRESSED_PREFIX):
+                    token_json = zlib.decompress(
+                        base64.b64decode(token_json[len(_KEYRING_COMPRESSED_PREFIX):])
+                    )
+                return json_codec.loads(token_json)
+        except KeyringError:
+            self._disable_keyring_if_unverified()
         except Exception:
             pass
         return None
@@ -256,13 +556,72 @@ class AuthManager:
             user_id: User email address
             token_data: Token data dictionary
         """
+        if self._keyring_ok is False:
+            return
+        
+        from keyring.errors import KeyringError
+        
         try:
-            token_json = json.dumps(token_data)
-            keyring.set_password(self.keyring_service, user_id, token_json)
-        except Exception:
+            token_bytes = json_codec.dumps_bytes(token_data)
+            compressed = _KEYRING_COMPRESSED_PREFIX + base64.b64encode(
+                zlib.compress(token_bytes, 1)
+            ).decode("ascii")
+            # Keep plain JSON when compression does not pay for the base64 overhead
+            token_json = compressed if len(compressed) < len(token_bytes) else token_bytes.decode("utf-8")
+            self._keyring.set_password(self.keyring_service, user_id, token_json)
+            self._keyring_ok = True
+        except KeyringError:
             # Keyring may not be available on all platforms
+            self._disable_keyring_if_unverified()
+        except Exception:
             pass
 
+    def _disable_keyring_if_unverified(self) -> None:
+        """Stop using keyring after it fails before ever working.
+
+        Headless hosts without a Secret Service raise on every keyring call
+        (often after a D-Bus timeout), so the first failure disables keyring
+        for this manager. A backend that has already worked stays enabled.
+        """
+        if self._keyring_ok is None:
+            self._keyring_ok = False
+
+    def _token_file_for(self, user_id: str) -> Path:
+        """Get the token file path for a user.
+
+        Args:
+            user_id: User email address
+
+        Returns:
+            Path to the user's token file (named by SHA-256 of the user ID)
+        """
+        digest = hashlib.sha256(user_id.encode("utf-8")).hexdigest()
+        return self.token_store_dir / f"{digest}.json"
+
+    def _migrate_legacy_token_file(self) -> None:
+        """Split a legacy shared tokens.json into per-user token files.
+
+        Earlier versions stored every user's tokens in one JSON file at
+        token_store_path. Existing per-user files win over legacy entries.
+        The legacy file holds every user's refresh token in plain text, so it
+        is deleted once all per-user files are written; on any failure it is
+        left in place and migration is retried on the next start.
+        """
+        if not self.token_store_path.is_file():
+            return
+        
+        try:
+            all_tokens = json_codec.loads(self.token_store_path.read_bytes())
+            
+            for user_id, token_data in all_tokens.items():
+                if not self._token_file_for(user_id).exists():
+                    self._save_to_file(user_id, token_data)
+            
+            self.token_store_path.unlink()
+        except Exception as e:
+            import logging
+            logging.warning(f"Failed to migrate legacy token file {self.token_store_path}: {e}")
+
     def _load_from_file(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Load credentials from file.
 
@@ -272,35 +631,47 @@ class AuthManager:
         Returns:
             Token data dictionary or None
         """
-        if not self.token_store_path.exists():
+        token_file = self._token_file_for(user_id)
+        try:
+            mtime_ns = os.stat(token_file).st_mtime_ns
+        except OSError:
+            self._file_cache.pop(user_id, None)
             return None
         
+        # Only re-parse the file if it changed on disk since we last read it
+        cached = self._file_cache.get(user_id)
+        if cached and cached[0] == mtime_ns:
+            return dict(cached[1])
+        
         try:
-            with open(self.token_store_path, "r") as f:
-                all_tokens = json.load(f)
-                return all_tokens.get(user_id)
+            token_data = json_codec.loads(token_file.read_bytes())
         except Exception:
             return None
+        self._file_cache[user_id] = (mtime_ns, token_data)
+        return dict(token_data)
 
     def _save_to_file(self, user_id: str, token_data: Dict[str, Any]) -> None:
         """Save credentials to file.
 
+        Writes only this user's token file, via a temporary file and an
+        atomic rename so a crash never leaves a truncated token file.
+
         Args:
             user_id: User email address
             token_data: Token data dictionary
         """
-        all_tokens = {}
-        if self.token_store_path.exists():
-            try:
-                with open(self.token_store_path, "r") as f:
-                    all_tokens = json.load(f)
-            except Exception:
-                pass
-        
-        all_tokens[user_id] = token_data
+        token_file = self._token_file_for(user_id)
+        tmp_file = token_file.with_suffix(".json.tmp")
+        data = json_codec.dumps_bytes(token_data)
         
-        with open(self.token_store_path, "w") as f:
-            json.dump(all_tokens, f, indent=2)
+        try:
+            tmp_file.write_bytes(data)
+        except FileNotFoundError:
+            # Token directory was removed after startup (e.g. `rm -r config/tokens`)
+            self.token_store_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file.write_bytes(data)
+        os.replace(tmp_file, token_file)
+        self._file_cache[user_id] = (os.stat(token_file).st_mtime_ns, dict(token_data))
 
     def _delete_credentials(self, user_id: str) -> None:
         """Delete stored credentials for a user (without revoking).
@@ -308,29 +679,21 @@ class AuthManager:
         Args:
             user_id: User email address
         """
-        # Remove from keyring
-        try:
-            keyring.delete_password(self.keyring_service, user_id)
-        except Exception:
-            pass
+        self._evict_cached_credentials(user_id)
         
-        # Remove from file
-        if self.token_store_path.exists():
+        # Remove from keyring
+        if self._keyring_ok is not False:
             try:
-                with open(self.token_store_path, "r") as f:
-                    all_tokens = json.load(f)
-                
-                if user_id in all_tokens:
-                    del all_tokens[user_id]
-                    
-                    if all_tokens:
-                        with open(self.token_store_path, "w") as f:
-                            json.dump(all_tokens, f, indent=2)
-                    else:
-                        # File is empty, delete it
-                        self.token_store_path.unlink()
+                self._keyring.delete_password(self.keyring_service, user_id)
             except Exception:
                 pass
+        
+        # Remove from file
+        self._file_cache.pop(user_id, None)
+        try:
+            self._token_file_for(user_id).unlink(missing_ok=True)
+        except Exception:
+            pass
 
     def revoke_credentials(self, user_id: str) -> None:
         """Revoke and remove credentials for a user.
@@ -342,7 +705,7 @@ class AuthManager:
         
         if credentials:
             try:
-                credentials.revoke(Request())
+                credentials.revoke(self._auth_request)
             except Exception:
                 pass
         
@@ -1,16 +1,45 @@
 """Base Google API client with rate limiting and error handling."""
 
+import random
+import time
+from functools import lru_cache
 from typing import Any, Dict, Optional
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
 
 from .rate_limiter import RateLimiter
+from ..utils import json_codec
+
+# Transient HTTP statuses that are retried with exponential backoff
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# 403 reasons Google APIs use for quota/rate limiting (retryable)
+_RATE_LIMIT_REASONS = frozenset({"rateLimitExceeded", "userRateLimitExceeded"})
+
+
+@lru_cache(maxsize=16)
+def _fetch_discovery_doc(api_name: str, api_version: str) -> Optional[str]:
+    """Read the bundled discovery document for an API once per process.
+
+    Args:
+        api_name: Name of the Google API (e.g., 'gmail')
+        api_version: API version (e.g., 'v1')
+
+    Returns:
+        Discovery document JSON string, or None if not bundled
+    """
+    return get_static_doc(api_name, api_version)
 
 
 class GoogleAPIClient:
     """Base class for Google API clients with rate limiting."""
 
+    # Total attempts (first try + retries) for transient errors
+    MAX_ATTEMPTS = 5
+    # Backoff base delay in seconds (doubles per attempt)
+    RETRY_BASE_DELAY = 0.25
+
     def __init__(
         self,
         credentials: Credentials,
@@ -34,12 +63,21 @@ class GoogleAPIClient:
         self.quota_cost = quota_cost
         self.rate_limiter = rate_limiter or RateLimiter()
         
-        self.service = build(api_name, api_version, credentials=credentials)
+        discovery_doc = _fetch_discovery_doc(api_name, api_version)
+        if discovery_doc is not None:
+            # Parse a fresh copy per client: googleapiclient mutates the document
+            self.service = build_from_document(
+                json_codec.loads(discovery_doc), credentials=credentials
+            )
+        else:
+            self.service = build(api_name, api_version, credentials=credentials)
 
     def _execute_request(
         self,
         request_method,
         *args,
+        quota_cost: Optional[int] = None,
+        retry_server_errors: bool = True,
         **kwargs
     ) -> Any:
         """Execute API request with rate limiting and error handling.
@@ -47,6 +85,12 @@ class GoogleAPIClient:
         Args:
             request_method: API request method to execute
             *args: Positional arguments for request
+            quota_cost: Quota units charged for this request (default: the
+                client's quota_cost)
+            retry_server_errors: Whether to retry 5xx responses. Pass False for
+                non-idempotent requests (e.g. sending a message), which may have
+                taken effect despite the error; rate limit rejections are
+                still retried.
             **kwargs: Keyword arguments for request
 
         Returns:
@@ -55,28 +99,82 @@ class GoogleAPIClient:
         Raises:
             HttpError: If API request fails
         """
-        # Apply rate limiting
-        self.rate_limiter.wait_if_needed(self.quota_cost)
+        if quota_cost is None:
+            quota_cost = self.quota_cost
         
-        try:
-            request = request_method(*args, **kwargs)
-            return request.execute()
-        except HttpError as error:
-            # Handle specific error cases
-            if error.resp.status == 429:
-                # Rate limit exceeded - wait and retry
-                self.rate_limiter.wait_if_needed(self.quota_cost * 2)
+        for attempt in range(self.MAX_ATTEMPTS):
+            # Apply rate limiting
+            self.rate_limiter.wait_if_needed(quota_cost)
+            
+            try:
                 request = request_method(*args, **kwargs)
                 return request.execute()
-            elif error.resp.status == 401:
-                # Unauthorized - credentials may need refresh
-                raise HttpError(
-                    error.resp,
-                    error.content,
-                    "Authentication failed. Please re-authenticate."
+            except HttpError as error:
+                # Handle specific error cases
+                if error.resp.status == 401:
+                    # Unauthorized - credentials may need refresh
+                    raise HttpError(
+                        error.resp,
+                        error.content,
+                        "Authentication failed. Please re-authenticate."
+                    )
+                if (
+                    not self._is_retryable(error, server_errors=retry_server_errors)
+                    or attempt == self.MAX_ATTEMPTS - 1
+                ):
+                    raise
+                # Rate limited or transient server error - back off and retry
+                time.sleep(self._retry_delay(error, attempt))
+
+    @staticmethod
+    def _is_retryable(error: Exception, server_errors: bool = True) -> bool:
+        """Check whether a failed request is worth retrying.
+
+        Args:
+            error: Exception raised for the request (HttpError or transport error)
+            server_errors: Whether transient server errors and connection
+                failures count as retryable; if False only rate limit
+                rejections (which the server did not act on) do
+
+        Returns:
+            True for rate limiting, transient server errors and connection
+            failures (e.g. SSL errors)
+        """
+        if isinstance(error, HttpError):
+            if error.resp.status == 429:
+                return True
+            if server_errors and error.resp.status in _RETRYABLE_STATUSES:
+                return True
+            if error.resp.status == 403 and isinstance(error.error_details, list):
+                return any(
+                    isinstance(detail, dict) and detail.get("reason") in _RATE_LIMIT_REASONS
+                    for detail in error.error_details
                 )
-            else:
-                raise
+            return False
+        return server_errors and isinstance(error, OSError)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """Compute how long to wait before retrying a failed request.
+
+        Uses exponential backoff with jitter, honoring a Retry-After header
+        (in seconds) when the server sends a longer delay.
+
+        Args:
+            error: HttpError returned by the API (or a transport error)
+            attempt: Zero-based attempt number that failed
+
+        Returns:
+            Delay in seconds
+        """
+        delay = self.RETRY_BASE_DELAY * (2 ** attempt)
+        resp = getattr(error, "resp", None)
+        retry_after = resp.get("retry-after") if resp is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return delay + random.random() * 0.1
 
     def get_service(self):
         """Get the underlying API service object.
@@ -1,10 +1,12 @@
 """Rate limiting for Google API requests."""
 
 import time
-from typing import Optional
-from collections import deque
+from typing import Optional, Tuple
 from threading import Lock
 
+# Sub-units per quota unit used for the integer bucket state
+NANO_UNITS = 1_000_000_000
+
 
 class RateLimiter:
     """Rate limiter for Google API quota management.
@@ -29,13 +31,31 @@ class RateLimiter:
         """
         self.quota_per_second = quota_per_second
         self.burst_size = burst_size or quota_per_second
-        self.current_quota = self.burst_size
-        self.last_reset = time.time()
         
-        # Track request timestamps for smoothing
-        self.request_times: deque = deque()
+        # Integer state: quota in nano-units (1e-9 of a unit) against a monotonic
+        # nanosecond clock, so refill is exact and immune to wall-clock jumps.
+        # Kept as one (quota_nano, last_reset_ns) tuple so readers can take a
+        # consistent snapshot with a single attribute load, without the lock.
+        self._burst_nano = self.burst_size * NANO_UNITS
+        # Seconds needed to accrue one nano-unit (multiply instead of dividing per wait)
+        self._seconds_per_nano = 1.0 / (quota_per_second * NANO_UNITS)
+        self._state: Tuple[int, int] = (self._burst_nano, time.monotonic_ns())
         self.lock = Lock()
 
+    def _projected_quota(self, state: Tuple[int, int], now_ns: int) -> int:
+        """Compute the quota available at now_ns from a state snapshot.
+
+        Args:
+            state: (quota_nano, last_reset_ns) snapshot
+            now_ns: Current time from time.monotonic_ns()
+
+        Returns:
+            Available quota in nano-units (negative while reserved quota is owed)
+        """
+        quota_nano, last_reset_ns = state
+        # units/s * ns == nano-units, so no division is needed
+        return min(self._burst_nano, quota_nano + (now_ns - last_reset_ns) * self.quota_per_second)
+
     def wait_if_needed(self, quota_cost: int = 1) -> None:
         """Wait if necessary to stay within rate limits.
 
@@ -43,62 +63,30 @@ class RateLimiter:
             quota_cost: Quota units required for this request (default: 1)
         """
         with self.lock:
-            now = time.time()
-            
-            # Reset quota if enough time has passed
-            elapsed = now - self.last_reset
-            if elapsed >= 1.0:
-                self.current_quota = min(
-                    self.burst_size,
-                    self.current_quota + int(elapsed * self.quota_per_second)
-                )
-                self.last_reset = now
-                
-                # Clean old request times (older than 1 second)
-                while self.request_times and self.request_times[0] < now - 1.0:
-                    self.request_times.popleft()
-            
-            # Check if we have enough quota
-            if self.current_quota < quota_cost:
-                # Calculate wait time
-                needed = quota_cost - self.current_quota
-                wait_seconds = needed / self.quota_per_second
-                
-                # Add small buffer
-                wait_seconds += 0.1
-                
-                time.sleep(wait_seconds)
-                
-                # Update quota after waiting
-                self.current_quota = self.burst_size
-            
-            # Deduct quota
-            self.current_quota -= quota_cost
-            self.request_times.append(now)
+            # Refill the bucket for the time elapsed since the last call, then
+            # reserve quota, going into debt if needed, so the wait below
+            # happens outside the lock and other callers are not blocked by it
+            now_ns = time.monotonic_ns()
+            quota_nano = self._projected_quota(self._state, now_ns) - quota_cost * NANO_UNITS
+            self._state = (quota_nano, now_ns)
+        
+        if quota_nano < 0:
+            # Wait exactly until the reserved quota has accrued
+            time.sleep(-quota_nano * self._seconds_per_nano)
 
     def reset_quota(self) -> None:
         """Reset quota to maximum (for testing or manual reset)."""
         with self.lock:
-            self.current_quota = self.burst_size
-            self.last_reset = time.time()
-            self.request_times.clear()
+            self._state = (self._burst_nano, time.monotonic_ns())
 
     def get_current_quota(self) -> int:
         """Get current available quota.
 
+        Lock-free: projects the quota from a snapshot of the bucket state
+        without writing it back, so monitoring never contends with
+        wait_if_needed.
+
         Returns:
             Available quota units
         """
-        with self.lock:
-            now = time.time()
-            elapsed = now - self.last_reset
-            
-            if elapsed >= 1.0:
-                self.current_quota = min(
-                    self.burst_size,
-                    self.current_quota + int(elapsed * self.quota_per_second)
-                )
-                self.last_reset = now
-            
-            return self.current_quota
-
+        return int(self._projected_quota(self._state, time.monotonic_ns()) / NANO_UNITS)
@@ -1,13 +1,22 @@
 """Scheduler for automated backup operations."""
 
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 from datetime import datetime
+from threading import Lock
 import croniter
 from ..utils.config import Config
 
 
 class Scheduler:
-    """Simple scheduler for backup operations."""
+    """Simple scheduler for backup operations.
+
+    Attributes:
+        enabled: Whether scheduling is enabled (config "schedule.enabled").
+            is_time_to_run returns False without reading the clock when this
+            is unset; tight polling loops can test it first and skip the call
+            entirely, e.g. ``if scheduler.enabled and scheduler.is_time_to_run(expr)``.
+    """
 
     def __init__(self, config: Optional[Config] = None):
         """Initialize Scheduler.
@@ -17,6 +26,36 @@ class Scheduler:
         """
         self.config = config or Config()
         self.enabled = self.config.get("schedule.enabled", False)
+        
+        # Parsed cron expressions, re-seeded per lookup instead of re-parsed
+        self._cron_cache: Dict[str, croniter.croniter] = {}
+        self._cron_lock = Lock()
+        
+        # Per expression: (last_run, next fire after it as epoch seconds), so
+        # "not yet" checks are a float compare
+        self._next_fire: Dict[str, Tuple[datetime, float]] = {}
+        # Per expression, for never-run jobs: (latest fire time, the fire time
+        # after it), both as epoch seconds
+        self._recent_fire: Dict[str, Tuple[float, float]] = {}
+
+    def _fire_time(self, cron_expression: str, base_time: datetime, previous: bool = False) -> datetime:
+        """Get the next (or previous) fire time of a cron expression.
+
+        Args:
+            cron_expression: Cron expression
+            base_time: Time to search from
+            previous: If True, return the last fire time at or before base_time
+
+        Returns:
+            Fire time as datetime
+        """
+        with self._cron_lock:
+            cron = self._cron_cache.get(cron_expression)
+            if cron is None:
+                cron = self._cron_cache[cron_expression] = croniter.croniter(cron_expression, base_time)
+            else:
+                cron.set_current(base_time, force=True)
+            return cron.get_prev(datetime) if previous else cron.get_next(datetime)
 
     def is_time_to_run(self, cron_expression: str, last_run: Optional[datetime] = None) -> bool:
         """Check if it's time to run based on cron expression.
@@ -31,17 +70,30 @@ class Scheduler:
         if not self.enabled:
             return False
         
+        # Compare as epoch floats; cron evaluation itself stays on local
+        # datetimes (croniter treats float base times as UTC)
+        now = time.time()
+        
         if last_run is None:
-            # If never run, check if current time matches
-            cron = croniter.croniter(cron_expression, datetime.now())
-            next_run = cron.get_prev(datetime)
+            # If never run, check if current time matches; the latest fire time
+            # only changes once the following one has passed
+            recent = self._recent_fire.get(cron_expression)
+            if recent is None or now >= recent[1]:
+                prev_run = self._fire_time(cron_expression, datetime.fromtimestamp(now), previous=True)
+                next_run = self._fire_time(cron_expression, prev_run)
+                recent = (prev_run.timestamp(), next_run.timestamp())
+                self._recent_fire[cron_expression] = recent
             # Run if next run was very recent (within last minute)
-            return (datetime.now() - next_run).total_seconds() < 60
+            return now - recent[0] < 60.0
         
-        cron = croniter.croniter(cron_expression, last_run)
-        next_run = cron.get_next(datetime)
+        cached = self._next_fire.get(cron_expression)
+        if cached is not None and cached[0] == last_run:
+            next_run_ts = cached[1]
+        else:
+            next_run_ts = self._fire_time(cron_expression, last_run).timestamp()
+            self._next_fire[cron_expression] = (last_run, next_run_ts)
         
-        return datetime.now() >= next_run
+        return now >= next_run_ts
 
     def get_next_run_time(self, cron_expression: str, last_run: Optional[datetime] = None) -> datetime:
         """Get next scheduled run time.
@@ -56,6 +108,4 @@ class Scheduler:
         if last_run is None:
             last_run = datetime.now()
         
-        cron = croniter.croniter(cron_expression, last_run)
-        return cron.get_next(datetime)
-
+        return self._fire_time(cron_expression, last_run)
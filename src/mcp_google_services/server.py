@@ -6,11 +6,15 @@ that enables Gmail backup and Google services management.
 
 import sys
 import asyncio
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Dict, Optional
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+# Only needed when run as a plain script (python src/mcp_google_services/server.py);
+# installed or `python -m` runs already resolve the package
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -26,397 +30,563 @@ from mcp_google_services.services.gmail.export import GmailExporter
 # Create MCP server instance
 app = Server("google-services")
 
+# Long-lived services shared by all tool calls (built on first use)
+_auth_manager: Optional[AuthManager] = None
+_gmail_apis: Dict[str, GmailAPI] = {}
 
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available MCP tools."""
-    return [
-        Tool(
-            name="gmail_backup",
-            description="Backup Gmail messages to MBOX format. Supports incremental and full backups.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "user_id": {
-                        "type": "string",
-                        "description": "Gmail user ID (default: 'me')",
-                        "default": "me"
-                    },
-                    "backup_type": {
-                        "type": "string",
-                        "enum": ["incremental", "full"],
-                        "description": "Type of backup to perform",
-                        "default": "incremental"
-                    },
-                    "max_results": {
-                        "type": "integer",
-                        "description": "Maximum number of messages to backup",
-                        "default": 1000
-                    },
-                    "query": {
-                        "type": "string",
-                        "description": "Optional Gmail query string to filter messages"
-                    }
+
+@lru_cache(maxsize=1)
+def _get_config() -> Config:
+    """Get the server configuration, loaded once per process.
+
+    Returns:
+        Shared Config instance (call _get_config.cache_clear() to reload)
+    """
+    return Config()
+
+
+def _get_auth_manager(config: Config) -> AuthManager:
+    """Get the shared AuthManager, creating it on first use.
+
+    Args:
+        config: Configuration used if the manager has to be created
+
+    Returns:
+        Shared AuthManager instance
+    """
+    global _auth_manager
+    if _auth_manager is None:
+        _auth_manager = AuthManager(config=config)
+    return _auth_manager
+
+
+def _get_gmail_api(user_id: str, credentials) -> GmailAPI:
+    """Get the cached GmailAPI client for a user.
+
+    The client is rebuilt only when the user's credentials object changed
+    (e.g. after re-authentication).
+
+    Args:
+        user_id: User email address or 'me'
+        credentials: Authenticated credentials for the user
+
+    Returns:
+        GmailAPI instance for the user
+    """
+    gmail_api = _gmail_apis.get(user_id)
+    if gmail_api is None or gmail_api.credentials is not credentials:
+        gmail_api = _gmail_apis[user_id] = GmailAPI(credentials=credentials)
+    return gmail_api
+
+
+@lru_cache(maxsize=8)
+def _get_backup_service(gmail_api: GmailAPI, config: Config) -> GmailBackup:
+    """Get the GmailBackup wrapper for a cached GmailAPI client.
+
+    Args:
+        gmail_api: GmailAPI instance from _get_gmail_api
+        config: Shared configuration
+
+    Returns:
+        GmailBackup bound to the client
+    """
+    return GmailBackup(api=gmail_api, config=config)
+
+
+@lru_cache(maxsize=8)
+def _get_exporter(gmail_api: GmailAPI) -> GmailExporter:
+    """Get the GmailExporter wrapper for a cached GmailAPI client.
+
+    Args:
+        gmail_api: GmailAPI instance from _get_gmail_api
+
+    Returns:
+        GmailExporter bound to the client
+    """
+    return GmailExporter(api=gmail_api)
+
+
+# Authentication failure replies, kept short since they land in the client's context
+_AUTH_ERRORS: Dict[str, str] = {
+    "oauth_failed": (
+        "OAuth authentication failed although the credentials file exists. "
+        "Check the consent screen scopes and test users, then run "
+        "`python setup_oauth.py` (or delete config/tokens and retry).\n"
+        "Error details: {error}"
+    ),
+    "credentials_missing": (
+        "Authentication required: Gmail needs an OAuth 2.0 credentials file "
+        "(gcloud application-default login lacks Gmail scopes). Download it from "
+        "Google Cloud Console to {path}, then run `python setup_oauth.py`."
+    ),
+}
+
+
+# Tool definitions are static, so build them once and return the same list
+_TOOLS: list[Tool] = [
+    Tool(
+        name="gmail_backup",
+        description="Backup Gmail messages to MBOX format. Supports incremental and full backups.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_id": {
+                    "type": "string",
+                    "description": "Gmail user ID (default: 'me')",
+                    "default": "me"
                 },
-                "required": []
-            }
-        ),
-        Tool(
-            name="gmail_export",
-            description="Export Gmail messages to various formats (MBOX, JSON, CSV, EML).",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "user_id": {
-                        "type": "string",
-                        "description": "Gmail user ID (default: 'me')",
-                        "default": "me"
-                    },
-                    "format": {
-                        "type": "string",
-                        "enum": ["mbox", "json", "csv", "eml"],
-                        "description": "Export format",
-                        "default": "mbox"
-                    },
-                    "output_path": {
-                        "type": "string",
-                        "description": "Output file path (optional, auto-generated if not provided)"
-                    },
-                    "max_results": {
-                        "type": "integer",
-                        "description": "Maximum number of messages to export",
-                        "default": 100
-                    },
-                    "query": {
-                        "type": "string",
-                        "description": "Optional Gmail query string to filter messages"
-                    }
+                "backup_type": {
+                    "type": "string",
+                    "enum": ["incremental", "full"],
+                    "description": "Type of backup to perform",
+                    "default": "incremental"
                 },
-                "required": []
-            }
-        ),
-        Tool(
-            name="gmail_list_messages",
-            description="List Gmail messages with optional filtering.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "user_id": {
-                        "type": "string",
-                        "description": "Gmail user ID (default: 'me')",
-                        "default": "me"
-                    },
-                    "query": {
-                        "type": "string",
-                        "description": "Gmail search query (e.g., 'from:example@gmail.com', 'has:attachment')"
-                    },
-                    "max_results": {
-                        "type": "integer",
-                        "description": "Maximum number of messages to return",
-                        "default": 10
-                    }
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of messages to backup",
+                    "default": 1000
                 },
-                "required": []
-            }
-        ),
-        Tool(
-            name="gmail_list_labels",
-            description="List all Gmail labels for a user.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "user_id": {
-                        "type": "string",
-                        "description": "Gmail user ID (default: 'me')",
-                        "default": "me"
-                    }
+                "query": {
+                    "type": "string",
+                    "description": "Optional Gmail query string to filter messages"
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="gmail_export",
+        description="Export Gmail messages to various formats (MBOX, JSON, CSV, EML).",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_id": {
+                    "type": "string",
+                    "description": "Gmail user ID (default: 'me')",
+                    "default": "me"
+                },
+                "format": {
+                    "type": "string",
+                    "enum": ["mbox", "json", "csv", "eml"],
+                    "description": "Export format",
+                    "default": "mbox"
+                },
+                "output_path": {
+                    "type": "string",
+                    "description": "Output file path (optional, auto-generated if not provided)"
                 },
-                "required": []
-            }
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of messages to export",
+                    "default": 100
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Optional Gmail query string to filter messages"
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="gmail_list_messages",
+        description=(
+            "List Gmail messages with optional filtering. Results are paged: "
+            "pass the returned page_token to get the next page, and stop when "
+            "no page_token is returned."
         ),
-        Tool(
-            name="gmail_send_message",
-            description="Send an email message via Gmail.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "user_id": {
-                        "type": "string",
-                        "description": "Gmail user ID (default: 'me')",
-                        "default": "me"
-                    },
-                    "to": {
-                        "type": "string",
-                        "description": "Recipient email address (required)"
-                    },
-                    "subject": {
-                        "type": "string",
-                        "description": "Email subject (required)"
-                    },
-                    "body": {
-                        "type": "string",
-                        "description": "Plain text email body (required if body_html not provided)"
-                    },
-                    "body_html": {
-                        "type": "string",
-                        "description": "HTML email body (optional, if provided will be used instead of body)"
-                    },
-                    "cc": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of CC email addresses (optional)"
-                    },
-                    "bcc": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of BCC email addresses (optional)"
-                    },
-                    "reply_to": {
-                        "type": "string",
-                        "description": "Reply-To email address (optional)"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_id": {
+                    "type": "string",
+                    "description": "Gmail user ID (default: 'me')",
+                    "default": "me"
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Gmail search query (e.g., 'from:example@gmail.com', 'has:attachment')"
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of messages per page",
+                    "default": 10
                 },
-                "required": ["to", "subject"]
-            }
+                "page_token": {
+                    "type": "string",
+                    "description": "Page token from a previous call, to fetch the next page"
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="gmail_list_labels",
+        description="List all Gmail labels for a user.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_id": {
+                    "type": "string",
+                    "description": "Gmail user ID (default: 'me')",
+                    "default": "me"
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="gmail_send_message",
+        description="Send an email message via Gmail.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_id": {
+                    "type": "string",
+                    "description": "Gmail user ID (default: 'me')",
+                    "default": "me"
+                },
+                "to": {
+                    "type": "string",
+                    "description": "Recipient email address (required)"
+                },
+                "subject": {
+                    "type": "string",
+                    "description": "Email subject (required)"
+                },
+                "body": {
+                    "type": "string",
+                    "description": "Plain text email body (required if body_html not provided)"
+                },
+                "body_html": {
+                    "type": "string",
+                    "description": "HTML email body (optional, if provided will be used instead of body)"
+                },
+                "cc": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of CC email addresses (optional)"
+                },
+                "bcc": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of BCC email addresses (optional)"
+                },
+                "reply_to": {
+                    "type": "string",
+                    "description": "Reply-To email address (optional)"
+                }
+            },
+            "required": ["to", "subject"]
+        }
+    )
+]
+
+
+def _handle_gmail_backup(user_id: str, credentials, arguments: Dict[str, Any]) -> list[TextContent]:
+    """Run an incremental or full MBOX backup.
+
+    Args:
+        user_id: Gmail user ID
+        credentials: Authenticated credentials for the user
+        arguments: Tool arguments
+
+    Returns:
+        Tool response content
+    """
+    backup_type = arguments.get("backup_type", "incremental")
+    max_results = arguments.get("max_results", 1000)
+    query = arguments.get("query")
+    
+    gmail_api = _get_gmail_api(user_id, credentials)
+    backup_service = _get_backup_service(gmail_api, _get_config())
+    
+    if backup_type == "incremental":
+        result = backup_service.incremental_backup(
+            user_id=user_id,
+            query=query,
+            max_results=max_results
+        )
+    else:
+        result = backup_service.full_backup(
+            user_id=user_id,
+            query=query,
+            max_results=max_results
+        )
+    
+    if result.success:
+        return [
+            TextContent(
+                type="text",
+                text=f"Backup completed successfully!\n"
+                     f"- Messages backed up: {result.message_count}\n"
+                     f"- Backup path: {result.backup_path or 'none (no new messages)'}\n"
+                     f"- Messages processed: {result.messages_processed}\n"
+                     f"- Messages failed: {result.messages_failed}"
+            )
+        ]
+    else:
+        return [
+            TextContent(
+                type="text",
+                text=f"Backup failed: {result.error}"
+            )
+        ]
+
+
+def _handle_gmail_export(user_id: str, credentials, arguments: Dict[str, Any]) -> list[TextContent]:
+    """Export messages to a file in the requested format.
+
+    Args:
+        user_id: Gmail user ID
+        credentials: Authenticated credentials for the user
+        arguments: Tool arguments
+
+    Returns:
+        Tool response content
+    """
+    export_format = arguments.get("format", "mbox")
+    output_path = arguments.get("output_path")
+    max_results = arguments.get("max_results", 100)
+    query = arguments.get("query")
+    
+    gmail_api = _get_gmail_api(user_id, credentials)
+    exporter = _get_exporter(gmail_api)
+    
+    result = exporter.export_messages(
+        user_id=user_id,
+        output_path=output_path,
+        format=export_format,
+        query=query,
+        max_results=max_results
+    )
+    
+    return [
+        TextContent(
+            type="text",
+            text=f"Export completed successfully!\n"
+                 f"- Format: {result['format']}\n"
+                 f"- Messages exported: {result['message_count']}\n"
+                 f"- Output path: {result['output_path']}\n"
+                 f"- File size: {result.get('file_size', 0):,} bytes"
         )
     ]
 
 
+def _handle_gmail_list_messages(user_id: str, credentials, arguments: Dict[str, Any]) -> list[TextContent]:
+    """List one page of messages with their snippets.
+
+    Args:
+        user_id: Gmail user ID
+        credentials: Authenticated credentials for the user
+        arguments: Tool arguments
+
+    Returns:
+        Tool response content
+    """
+    query = arguments.get("query")
+    max_results = arguments.get("max_results", 10)
+    page_token = arguments.get("page_token")
+    
+    gmail_api = _get_gmail_api(user_id, credentials)
+    result = gmail_api.list_messages(
+        user_id=user_id,
+        query=query,
+        max_results=max_results,
+        page_token=page_token,
+    )
+    
+    messages = result.get("messages", [])
+    
+    # messages.list returns only IDs; fetch the snippets for the whole
+    # page in one HTTP batch call instead of one get per message
+    snippets: Dict[str, str] = {}
+    if messages:
+        fetched = gmail_api.batch_get_messages(
+            user_id=user_id,
+            message_ids=[msg["id"] for msg in islice(messages, max_results)],
+            format="minimal",
+        )
+        snippets = {msg["id"]: msg.get("snippet", "") for msg in fetched}
+    
+    message_list = "\n".join(
+        f"- {msg.get('id', 'unknown')}: {snippets.get(msg.get('id'), '')[:50]}..."
+        for msg in islice(messages, max_results)
+    )
+    
+    text = f"Found {len(messages)} messages:\n{message_list}"
+    next_page_token = result.get("nextPageToken")
+    if next_page_token:
+        text += f"\n\nMore results available. Next page_token: {next_page_token}"
+    
+    return [
+        TextContent(
+            type="text",
+            text=text
+        )
+    ]
+
+
+def _handle_gmail_list_labels(user_id: str, credentials, arguments: Dict[str, Any]) -> list[TextContent]:
+    """List the user's labels.
+
+    Args:
+        user_id: Gmail user ID
+        credentials: Authenticated credentials for the user
+        arguments: Tool arguments
+
+    Returns:
+        Tool response content
+    """
+    gmail_api = _get_gmail_api(user_id, credentials)
+    labels = gmail_api.list_labels(user_id=user_id)
+    
+    label_list = "\n".join(
+        f"- {label.get('name', '')}" for label in islice(labels, 20)
+    )
+    
+    return [
+        TextContent(
+            type="text",
+            text=f"Found {len(labels)} labels:\n{label_list}"
+        )
+    ]
+
+
+def _handle_gmail_send_message(user_id: str, credentials, arguments: Dict[str, Any]) -> list[TextContent]:
+    """Send an email message.
+
+    Args:
+        user_id: Gmail user ID
+        credentials: Authenticated credentials for the user
+        arguments: Tool arguments
+
+    Returns:
+        Tool response content
+    """
+    to = arguments.get("to")
+    subject = arguments.get("subject")
+    body = arguments.get("body")
+    body_html = arguments.get("body_html")
+    cc = arguments.get("cc")
+    bcc = arguments.get("bcc")
+    reply_to = arguments.get("reply_to")
+    
+    if not to:
+        return [
+            TextContent(
+                type="text",
+                text="Error: 'to' email address is required"
+            )
+        ]
+    if not subject:
+        return [
+            TextContent(
+                type="text",
+                text="Error: 'subject' is required"
+            )
+        ]
+    if not body and not body_html:
+        return [
+            TextContent(
+                type="text",
+                text="Error: Either 'body' or 'body_html' is required"
+            )
+        ]
+    
+    gmail_api = _get_gmail_api(user_id, credentials)
+    result = gmail_api.send_message(
+        user_id=user_id,
+        to=to,
+        subject=subject,
+        body=body,
+        body_html=body_html,
+        cc=cc,
+        bcc=bcc,
+        reply_to=reply_to
+    )
+    
+    return [
+        TextContent(
+            type="text",
+            text=f"✅ Email sent successfully!\n"
+                 f"- Message ID: {result.get('id', 'unknown')}\n"
+                 f"- Thread ID: {result.get('threadId', 'unknown')}\n"
+                 f"- To: {to}\n"
+                 f"- Subject: {subject}"
+        )
+    ]
+
+
+# Tool name -> handler(user_id, credentials, arguments)
+_TOOL_HANDLERS: Dict[str, Callable[[str, Any, Dict[str, Any]], list[TextContent]]] = {
+    "gmail_backup": _handle_gmail_backup,
+    "gmail_export": _handle_gmail_export,
+    "gmail_list_messages": _handle_gmail_list_messages,
+    "gmail_list_labels": _handle_gmail_list_labels,
+    "gmail_send_message": _handle_gmail_send_message,
+}
+
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available MCP tools."""
+    return _TOOLS
+
+
 @app.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Handle tool calls."""
+    handler = _TOOL_HANDLERS.get(name)
+    if handler is None:
+        return [
+            TextContent(
+                type="text",
+                text=f"Unknown tool: {name}"
+            )
+        ]
+    
     try:
-        config = Config()
-        auth_manager = AuthManager(config=config)
+        auth_manager = _get_auth_manager(_get_config())
         
         user_id = arguments.get("user_id", "me")
         
         # Authenticate
         try:
-            # Run authentication in thread pool to avoid blocking async context
-            # OAuth flow may open browser and block, so run it in separate thread
-            credentials = await asyncio.to_thread(auth_manager.get_credentials, user_id)
+            # Token store I/O, refreshes and the OAuth browser flow all block,
+            # so get_credentials_async runs them off the event loop
+            credentials = await auth_manager.get_credentials_async(user_id)
         except FileNotFoundError as e:
             error_msg = str(e)
             # Check if credentials.json exists - if so, OAuth flow should work
-            from pathlib import Path
             credentials_path = Path(auth_manager.config.get("google_apis.credentials_path", "config/credentials.json"))
             
             if credentials_path.exists():
                 # Credentials file exists, OAuth flow should work
                 # This error shouldn't happen, but if it does, provide OAuth instructions
-                return [
-                    TextContent(
-                        type="text",
-                        text=f"🔐 OAuth Authentication Required\n\n"
-                             f"Credentials file found, but authentication failed.\n\n"
-                             f"This may happen if:\n"
-                             f"  • OAuth consent screen needs new scopes added\n"
-                             f"  • You need to be added as a test user\n"
-                             f"  • Token storage needs to be cleared\n\n"
-                             f"Try running the setup script:\n"
-                             f"  python setup_oauth.py\n\n"
-                             f"Or manually delete tokens and try again:\n"
-                             f"  rm config/tokens.json\n\n"
-                             f"Error details: {error_msg}"
-                    )
-                ]
-            else:
+                text = _AUTH_ERRORS["oauth_failed"].format(error=error_msg)
+            elif "gcloud auth application-default login" in error_msg:
                 # No credentials file - provide setup instructions
-                if "gcloud auth application-default login" in error_msg:
-                    return [
-                        TextContent(
-                            type="text",
-                            text=f"🔐 Authentication Required\n\n"
-                                 f"For Gmail API, you need OAuth 2.0 credentials file:\n\n"
-                                 f"  1. Download OAuth 2.0 credentials from Google Cloud Console\n"
-                                 f"  2. Place them in: {credentials_path}\n"
-                                 f"  3. Run: python setup_oauth.py\n\n"
-                                 f"Note: gcloud auth application-default login doesn't support Gmail scopes.\n"
-                        )
-                    ]
-                else:
-                    return [
-                        TextContent(
-                            type="text",
-                            text=f"Error: {error_msg}"
-                        )
-                    ]
-        except Exception as e:
-            return [
-                TextContent(
-                    type="text",
-                    text=f"Authentication error: {str(e)}"
-                )
-            ]
-        
-        if name == "gmail_backup":
-            backup_type = arguments.get("backup_type", "incremental")
-            max_results = arguments.get("max_results", 1000)
-            query = arguments.get("query")
-            
-            gmail_api = GmailAPI(credentials=credentials)
-            backup_service = GmailBackup(api=gmail_api, config=config)
-            
-            if backup_type == "incremental":
-                result = backup_service.incremental_backup(
-                    user_id=user_id,
-                    query=query,
-                    max_results=max_results
-                )
+                text = _AUTH_ERRORS["credentials_missing"].format(path=credentials_path)
             else:
-                result = backup_service.full_backup(
-                    user_id=user_id,
-                    query=query,
-                    max_results=max_results
-                )
-            
-            if result.success:
-                return [
-                    TextContent(
-                        type="text",
-                        text=f"Backup completed successfully!\n"
-                             f"- Messages backed up: {result.message_count}\n"
-                             f"- Backup path: {result.backup_path}\n"
-                             f"- Messages processed: {result.messages_processed}\n"
-                             f"- Messages failed: {result.messages_failed}"
-                    )
-                ]
-            else:
-                return [
-                    TextContent(
-                        type="text",
-                        text=f"Backup failed: {result.error}"
-                    )
-                ]
-        
-        elif name == "gmail_export":
-            export_format = arguments.get("format", "mbox")
-            output_path = arguments.get("output_path")
-            max_results = arguments.get("max_results", 100)
-            query = arguments.get("query")
-            
-            gmail_api = GmailAPI(credentials=credentials)
-            exporter = GmailExporter(api=gmail_api)
-            
-            result = exporter.export_messages(
-                user_id=user_id,
-                output_path=output_path,
-                format=export_format,
-                query=query,
-                max_results=max_results
-            )
-            
+                text = f"Error: {error_msg}"
             return [
                 TextContent(
                     type="text",
-                    text=f"Export completed successfully!\n"
-                         f"- Format: {result['format']}\n"
-                         f"- Messages exported: {result['message_count']}\n"
-                         f"- Output path: {result['output_path']}\n"
-                         f"- File size: {result.get('file_size', 0):,} bytes"
+                    text=text
                 )
             ]
-        
-        elif name == "gmail_list_messages":
-            query = arguments.get("query")
-            max_results = arguments.get("max_results", 10)
-            
-            gmail_api = GmailAPI(credentials=credentials)
-            result = gmail_api.list_messages(
-                user_id=user_id,
-                query=query,
-                max_results=max_results
-            )
-            
-            messages = result.get("messages", [])
-            message_list = "\n".join([
-                f"- {msg.get('id', 'unknown')}: {msg.get('snippet', '')[:50]}..."
-                for msg in messages[:max_results]
-            ])
-            
-            return [
-                TextContent(
-                    type="text",
-                    text=f"Found {len(messages)} messages:\n{message_list}"
-                )
-            ]
-        
-        elif name == "gmail_list_labels":
-            gmail_api = GmailAPI(credentials=credentials)
-            labels = gmail_api.list_labels(user_id=user_id)
-            
-            label_names = [label.get("name", "") for label in labels]
-            label_list = "\n".join([f"- {name}" for name in label_names[:20]])
-            
-            return [
-                TextContent(
-                    type="text",
-                    text=f"Found {len(labels)} labels:\n{label_list}"
-                )
-            ]
-        
-        elif name == "gmail_send_message":
-            to = arguments.get("to")
-            subject = arguments.get("subject")
-            body = arguments.get("body")
-            body_html = arguments.get("body_html")
-            cc = arguments.get("cc")
-            bcc = arguments.get("bcc")
-            reply_to = arguments.get("reply_to")
-            
-            if not to:
-                return [
-                    TextContent(
-                        type="text",
-                        text="Error: 'to' email address is required"
-                    )
-                ]
-            if not subject:
-                return [
-                    TextContent(
-                        type="text",
-                        text="Error: 'subject' is required"
-                    )
-                ]
-            if not body and not body_html:
-                return [
-                    TextContent(
-                        type="text",
-                        text="Error: Either 'body' or 'body_html' is required"
-                    )
-                ]
-            
-            gmail_api = GmailAPI(credentials=credentials)
-            result = gmail_api.send_message(
-                user_id=user_id,
-                to=to,
-                subject=subject,
-                body=body,
-                body_html=body_html,
-                cc=cc,
-                bcc=bcc,
-                reply_to=reply_to
-            )
-            
+        except Exception as e:
+            # Don't keep serving a client bound to credentials that no longer work
+            _gmail_apis.pop(user_id, None)
             return [
                 TextContent(
                     type="text",
-                    text=f"✅ Email sent successfully!\n"
-                         f"- Message ID: {result.get('id', 'unknown')}\n"
-                         f"- Thread ID: {result.get('threadId', 'unknown')}\n"
-                         f"- To: {to}\n"
-                         f"- Subject: {subject}"
+                    text=f"Authentication error: {str(e)}"
                 )
             ]
         
-        else:
-            return [
-                TextContent(
-                    type="text",
-                    text=f"Unknown tool: {name}"
-                )
-            ]
+        return handler(user_id, credentials, arguments)
     
     except Exception as e:
         return [
@@ -430,6 +600,10 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
 async def main():
     """Main entry point for MCP server."""
     try:
+        # Build shared services once, before serving, so the first tool call
+        # does not pay for config loading and token store setup
+        _get_auth_manager(_get_config())
+        
         async with stdio_server() as (read_stream, write_stream):
             await app.run(
                 read_stream,
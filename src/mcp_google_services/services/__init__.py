@@ -1,7 +1,21 @@
 """Google Services MCP Server - Services Package."""
 
-from .gmail import GmailAPI
+import importlib
+
+# Public name -> submodule; imported on first access (PEP 562) so importing
+# the package does not pull in googleapiclient
+_LAZY_IMPORTS = {
+    "GmailAPI": ".gmail",
+}
 
 __all__ = [
     "GmailAPI",
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
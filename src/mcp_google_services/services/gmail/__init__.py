@@ -1,10 +1,17 @@
 """Gmail service for Google Services MCP Server."""
 
-from .api import GmailAPI
-from .parser import EmailParser
-from .mbox import MBOXGenerator
-from .backup import GmailBackup, BackupResult
-from .export import GmailExporter
+import importlib
+
+# Public name -> submodule; imported on first access (PEP 562) so using one
+# class (e.g. GmailAPI) does not load the backup/export/MBOX modules too
+_LAZY_IMPORTS = {
+    "GmailAPI": ".api",
+    "EmailParser": ".parser",
+    "MBOXGenerator": ".mbox",
+    "GmailBackup": ".backup",
+    "BackupResult": ".backup",
+    "GmailExporter": ".export",
+}
 
 __all__ = [
     "GmailAPI",
@@ -15,3 +22,10 @@ __all__ = [
     "GmailExporter",
 ]
 
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,14 @@
 """Gmail API client for email operations."""
 
 import base64
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Optional, Dict, Any
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 from google.oauth2.credentials import Credentials
 
 from ...core.client import GoogleAPIClient
@@ -18,6 +23,14 @@ class GmailAPI(GoogleAPIClient):
     GET_QUOTA_COST = 5
     BATCH_GET_QUOTA_COST = 5
 
+    # Requests per HTTP batch call (Gmail accepts 100, but larger batches
+    # tend to trigger per-item 429 "Too many concurrent requests")
+    BATCH_SIZE = 50
+
+    # HTTP batch calls one user may have in flight at once, across a client
+    # and its clones (fetch_batches runs several clones in parallel)
+    MAX_CONCURRENT_BATCHES = 2
+
     def __init__(
         self,
         credentials: Credentials,
@@ -38,6 +51,31 @@ class GmailAPI(GoogleAPIClient):
         )
         self.messages_service = self.service.users().messages()
         self.labels_service = self.service.users().labels()
+        
+        # Bind the request builders once instead of resolving them per call
+        self._messages_list = self.messages_service.list
+        self._messages_get = self.messages_service.get
+        self._messages_send = self.messages_service.send
+        self._labels_list = self.labels_service.list
+        self._labels_get = self.labels_service.get
+        
+        # Shared with clones: they act for the same user and count against
+        # the same per-user concurrent request limit
+        self._batch_slots = threading.BoundedSemaphore(self.MAX_CONCURRENT_BATCHES)
+
+    def clone(self) -> "GmailAPI":
+        """Create a client sharing credentials and rate limiter with this one.
+
+        The clone has its own HTTP connection; httplib2 is not thread-safe,
+        so use one client per thread. Clones also share the limit on
+        concurrent batch calls (MAX_CONCURRENT_BATCHES).
+
+        Returns:
+            New GmailAPI instance
+        """
+        api = GmailAPI(credentials=self.credentials, rate_limiter=self.rate_limiter)
+        api._batch_slots = self._batch_slots
+        return api
 
     def list_messages(
         self,
@@ -76,21 +114,55 @@ class GmailAPI(GoogleAPIClient):
         if label_ids:
             request_params["labelIds"] = label_ids
         
-        def request_method(*args, **kwargs):
-            return self.messages_service.list(*args, **kwargs)
-        
         # Use list quota cost
-        original_quota_cost = self.quota_cost
-        self.quota_cost = self.LIST_QUOTA_COST
-        
-        try:
-            response = self._execute_request(
-                request_method,
-                **request_params
+        response = self._execute_request(
+            self._messages_list,
+            quota_cost=self.LIST_QUOTA_COST,
+            **request_params
+        )
+        return response
+
+    def iter_messages(
+        self,
+        user_id: str = "me",
+        query: Optional[str] = None,
+        page_size: int = 500,
+        label_ids: Optional[List[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over all messages matching the query, one page at a time.
+
+        Pages are requested lazily, so only the current page is held in
+        memory. Stop early (e.g. with itertools.islice) to avoid fetching
+        further pages.
+
+        Args:
+            user_id: User's email address or 'me' (default: 'me')
+            query: Gmail search query (optional)
+            page_size: Messages requested per page (default: 500, max: 500)
+            label_ids: Only return messages with these label IDs (optional)
+
+        Yields:
+            Message dictionaries with 'id' and 'threadId'
+
+        Example:
+            >>> api = GmailAPI(credentials)
+            >>> for message in api.iter_messages(query='has:attachment'):
+            ...     print(message['id'])
+        """
+        page_token = None
+        while True:
+            response = self.list_messages(
+                user_id=user_id,
+                query=query,
+                max_results=page_size,
+                page_token=page_token,
+                label_ids=label_ids,
             )
-            return response
-        finally:
-            self.quota_cost = original_quota_cost
+            yield from response.get("messages", [])
+            
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return
 
     def get_message(
         self,
@@ -118,35 +190,27 @@ class GmailAPI(GoogleAPIClient):
         if not message_id:
             raise ValueError("message_id is required")
         
-        def request_method(*args, **kwargs):
-            return self.messages_service.get(*args, **kwargs)
-        
         # Use get quota cost
-        original_quota_cost = self.quota_cost
-        self.quota_cost = self.GET_QUOTA_COST
-        
-        try:
-            response = self._execute_request(
-                request_method,
-                userId=user_id,
-                id=message_id,
-                format=format,
-            )
-            return response
-        finally:
-            self.quota_cost = original_quota_cost
+        response = self._execute_request(
+            self._messages_get,
+            quota_cost=self.GET_QUOTA_COST,
+            userId=user_id,
+            id=message_id,
+            format=format,
+        )
+        return response
 
     def batch_get_messages(
         self,
         user_id: str = "me",
-        message_ids: List[str] = None,
+        message_ids: Iterable[str] = None,
         format: str = "full",
     ) -> List[Dict[str, Any]]:
         """Get multiple messages by IDs (batch operation).
 
         Args:
             user_id: User's email address or 'me' (default: 'me')
-            message_ids: List of message IDs to retrieve
+            message_ids: Message IDs to retrieve (any iterable, e.g. a generator)
             format: Message format. Options: 'full', 'metadata', 'minimal', 'raw' (default: 'full')
 
         Returns:
@@ -159,25 +223,148 @@ class GmailAPI(GoogleAPIClient):
             >>> api = GmailAPI(credentials)
             >>> messages = api.batch_get_messages(message_ids=['12345', '67890'])
         """
+        message_ids = list(message_ids or ())
         if not message_ids:
             raise ValueError("message_ids list is required and cannot be empty")
         
-        # Gmail API batchGet supports up to 1000 messages
-        # But we'll process in chunks to be safe
-        chunk_size = 100
-        all_messages = []
+        # Gmail has no messages.batchGet; use the HTTP batch endpoint so each
+        # chunk of gets costs one round-trip instead of one per message
+        results: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, Exception] = {}
         
-        # Gmail API doesn't have batchGet - fetch individually with rate limiting
-        for msg_id in message_ids:
+        def callback(request_id, response, exception):
+            if exception is not None:
+                errors[request_id] = exception
+            else:
+                results[request_id] = response
+        
+        # Batch request IDs must be unique
+        pending = list(dict.fromkeys(message_ids))
+        failed: Dict[str, Exception] = {}
+        for attempt in range(self.MAX_ATTEMPTS):
+            errors.clear()
+            for start in range(0, len(pending), self.BATCH_SIZE):
+                chunk = pending[start:start + self.BATCH_SIZE]
+                batch = self.service.new_batch_http_request(callback=callback)
+                for msg_id in chunk:
+                    batch.add(
+                        self._messages_get(userId=user_id, id=msg_id, format=format),
+                        request_id=msg_id,
+                    )
+                
+                self.rate_limiter.wait_if_needed(self.BATCH_GET_QUOTA_COST * len(chunk))
+                try:
+                    # Each item is a separate request to Gmail; too many at once
+                    # per user fail with 429 "Too many concurrent requests"
+                    with self._batch_slots:
+                        batch.execute()
+                except Exception as e:
+                    # Transport failure (e.g. an SSL error) loses the rest of the chunk
+                    for msg_id in chunk:
+                        if msg_id not in results:
+                            errors.setdefault(msg_id, e)
+            
+            # Re-send only the items that were rate limited or hit transient errors
+            pending = []
+            for msg_id, error in errors.items():
+                if self._is_retryable(error) and attempt < self.MAX_ATTEMPTS - 1:
+                    pending.append(msg_id)
+                else:
+                    failed[msg_id] = error
+            if not pending:
+                break
+            time.sleep(self._retry_delay(errors[pending[0]], attempt))
+        
+        if failed:
+            import logging
+            for msg_id, error in failed.items():
+                logging.warning(f"Failed to get message {msg_id}: {error}")
+        
+        return [results[msg_id] for msg_id in message_ids if msg_id in results]
+
+    def iter_message_id_batches(
+        self,
+        user_id: str = "me",
+        query: Optional[str] = None,
+        max_results: int = 1000,
+        batch_size: int = 100,
+    ) -> Iterator[List[str]]:
+        """Yield matching message IDs in batches as listing pages arrive.
+
+        Args:
+            user_id: User's email address or 'me' (default: 'me')
+            query: Gmail search query (optional)
+            max_results: Maximum number of message IDs in total (default: 1000)
+            batch_size: IDs per batch, also used as the page size (default: 100)
+
+        Yields:
+            Lists of up to batch_size message IDs
+        """
+        messages = islice(
+            self.iter_messages(user_id=user_id, query=query, page_size=batch_size),
+            max_results,
+        )
+        while True:
+            batch = [msg["id"] for msg in islice(messages, batch_size)]
+            if not batch:
+                return
+            yield batch
+
+    def fetch_batches(
+        self,
+        id_batches: Iterable[List[str]],
+        user_id: str = "me",
+        format: str = "full",
+        workers: int = 4,
+    ) -> Iterator[Tuple[List[str], Optional[List[Dict[str, Any]]]]]:
+        """Fetch batches of messages on worker threads, yielding them in order.
+
+        Batches are submitted as id_batches produces them (e.g. while the next
+        listing page is still being requested), with at most workers * 2
+        fetched-but-unconsumed batches held in memory.
+
+        Args:
+            id_batches: Iterable of message ID lists (e.g. from iter_message_id_batches)
+            user_id: User's email address or 'me' (default: 'me')
+            format: Message format passed to batch_get_messages (default: 'full')
+            workers: Number of fetch threads (default: 4)
+
+        Yields:
+            (batch IDs, messages) tuples in submission order; messages is None
+            if the whole batch failed
+        """
+        worker_state = threading.local()
+        
+        def fetch(batch: List[str]) -> List[Dict[str, Any]]:
+            # httplib2 connections are not thread-safe, so each worker gets its own client
+            api = getattr(worker_state, "api", None)
+            if api is None:
+                api = worker_state.api = self.clone()
+            return api.batch_get_messages(user_id=user_id, message_ids=batch, format=format)
+        
+        def result(batch: List[str], future: Future) -> Tuple[List[str], Optional[List[Dict[str, Any]]]]:
             try:
-                message = self.get_message(user_id=user_id, message_id=msg_id, format=format)
-                all_messages.append(message)
+                return batch, future.result()
             except Exception as e:
                 import logging
-                logging.warning(f"Failed to get message {msg_id}: {e}")
-                continue
+                logging.warning(f"Failed to get batch of {len(batch)} messages: {e}")
+                return batch, None
         
-        return all_messages
+        in_flight: Deque[Tuple[List[str], Future]] = deque()
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            for batch in id_batches:
+                in_flight.append((batch, executor.submit(fetch, batch)))
+                if len(in_flight) >= workers * 2:
+                    yield result(*in_flight.popleft())
+            
+            while in_flight:
+                yield result(*in_flight.popleft())
+        finally:
+            # Consumer stopped early: don't start batches nobody will read
+            for _, future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=True)
 
     def list_labels(
         self,
@@ -196,21 +383,13 @@ class GmailAPI(GoogleAPIClient):
             >>> labels = api.list_labels()
             >>> label_names = [label['name'] for label in labels]
         """
-        def request_method(*args, **kwargs):
-            return self.labels_service.list(*args, **kwargs)
-        
         # Labels list is cheaper (1 unit)
-        original_quota_cost = self.quota_cost
-        self.quota_cost = 1
-        
-        try:
-            response = self._execute_request(
-                request_method,
-                userId=user_id,
-            )
-            return response.get("labels", [])
-        finally:
-            self.quota_cost = original_quota_cost
+        response = self._execute_request(
+            self._labels_list,
+            quota_cost=1,
+            userId=user_id,
+        )
+        return response.get("labels", [])
 
     def get_label(
         self,
@@ -232,21 +411,13 @@ class GmailAPI(GoogleAPIClient):
         if not label_id:
             raise ValueError("label_id is required")
         
-        def request_method(*args, **kwargs):
-            return self.labels_service.get(*args, **kwargs)
-        
-        original_quota_cost = self.quota_cost
-        self.quota_cost = 1
-        
-        try:
-            response = self._execute_request(
-                request_method,
-                userId=user_id,
-                id=label_id,
-            )
-            return response
-        finally:
-            self.quota_cost = original_quota_cost
+        response = self._execute_request(
+            self._labels_get,
+            quota_cost=1,
+            userId=user_id,
+            id=label_id,
+        )
+        return response
 
     def send_message(
         self,
@@ -313,20 +484,14 @@ class GmailAPI(GoogleAPIClient):
         # Encode message in base64url format
         raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
 
-        def request_method(*args, **kwargs):
-            return self.messages_service.send(*args, **kwargs)
-
-        # Send message quota cost is 100 units
-        original_quota_cost = self.quota_cost
-        self.quota_cost = 100
-
-        try:
-            response = self._execute_request(
-                request_method,
-                userId=user_id,
-                body={'raw': raw_message}
-            )
-            return response
-        finally:
-            self.quota_cost = original_quota_cost
+        # Send message quota cost is 100 units; a 5xx may arrive after the
+        # message was accepted, so only rate limit rejections are retried
+        response = self._execute_request(
+            self._messages_send,
+            quota_cost=100,
+            retry_server_errors=False,
+            userId=user_id,
+            body={'raw': raw_message}
+        )
+        return response
 
@@ -1,17 +1,25 @@
 """Gmail backup operations."""
 
-import json
+import os
+from contextlib import nullcontext
+from itertools import chain
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import AbstractSet, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 
 from .api import GmailAPI
 from .parser import EmailParser
 from .mbox import MBOXGenerator
+from ...utils import json_codec
 from ...utils.config import Config
 
 
+# Called as progress_callback(messages_done, messages_listed) during a backup;
+# messages_listed keeps growing until listing is complete
+ProgressCallback = Callable[[int, int], None]
+
+
 @dataclass
 class BackupResult:
     """Result of a backup operation."""
@@ -24,6 +32,7 @@ class BackupResult:
     error: Optional[str] = None
     messages_processed: int = 0
     messages_failed: int = 0
+    messages_skipped: int = 0
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -37,6 +46,15 @@ class BackupResult:
 class GmailBackup:
     """Gmail backup service."""
 
+    # Message IDs fetched per batch_get_messages call
+    BATCH_SIZE = 100
+    # Batches fetched concurrently while the next page is listed and
+    # finished batches are written
+    FETCH_WORKERS = 4
+    # Incremental runs a failing message may hold back the cursor before it
+    # is given up on
+    MAX_FAILED_RUNS = 3
+
     def __init__(self, api: GmailAPI, config: Optional[Config] = None):
         """Initialize GmailBackup.
 
@@ -48,6 +66,8 @@ class GmailBackup:
         self.config = config or Config()
         self.backup_folder = Path(self.config.get("gmail.backup_folder", "backups/gmail"))
         self.state_file = self.backup_folder / "backup_state.json"
+        # (file mtime_ns, parsed state) of the last state read or write
+        self._state_cache: Optional[Tuple[int, Dict[str, Any]]] = None
         self.parser = EmailParser()
         
         # Ensure backup folder exists
@@ -58,6 +78,7 @@ class GmailBackup:
         user_id: str = "me",
         query: Optional[str] = None,
         max_results: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None,
     ) -> BackupResult:
         """Perform incremental backup (only new messages since last backup).
 
@@ -65,6 +86,8 @@ class GmailBackup:
             user_id: User email address or 'me' (default: 'me')
             query: Optional Gmail query string
             max_results: Maximum number of messages (default: from config)
+            progress_callback: Optional callable invoked as (done, listed) after
+                each batch of messages is written
 
         Returns:
             BackupResult object
@@ -88,17 +111,28 @@ class GmailBackup:
             if max_results is None:
                 max_results = self.config.get("gmail.max_messages_per_backup", 1000)
             
-            # Perform backup
+            # Perform backup, skipping messages an earlier run already saved
+            failed_ids: Set[str] = set()
             result = self._backup_messages(
                 user_id=user_id,
                 query=query,
                 max_results=max_results,
                 backup_type="incremental",
+                progress_callback=progress_callback,
+                skip_ids=self._load_backed_up_ids(user_id),
+                failed_ids=failed_ids,
             )
             
-            # Update backup state
+            # Update backup state; failed messages hold the cursor back so
+            # they are listed (and retried) next time
             if result.success:
-                self._update_backup_state(user_id, start_time)
+                id_log = Path(result.backup_path).with_suffix(".ids") if result.backup_path else None
+                self._update_backup_state(
+                    user_id,
+                    start_time,
+                    id_log=id_log.name if id_log and id_log.exists() else None,
+                    failed_ids=failed_ids,
+                )
             
             result.start_time = start_time
             result.end_time = datetime.now()
@@ -120,6 +154,7 @@ class GmailBackup:
         user_id: str = "me",
         query: Optional[str] = None,
         max_results: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None,
     ) -> BackupResult:
         """Perform full backup of all messages.
 
@@ -127,6 +162,8 @@ class GmailBackup:
             user_id: User email address or 'me' (default: 'me')
             query: Optional Gmail query string
             max_results: Maximum number of messages (default: from config)
+            progress_callback: Optional callable invoked as (done, listed) after
+                each batch of messages is written
 
         Returns:
             BackupResult object
@@ -142,6 +179,7 @@ class GmailBackup:
                 query=query,
                 max_results=max_results,
                 backup_type="full",
+                progress_callback=progress_callback,
             )
             
             result.start_time = start_time
@@ -165,14 +203,25 @@ class GmailBackup:
         query: Optional[str] = None,
         max_results: int = 1000,
         backup_type: str = "incremental",
+        progress_callback: Optional[ProgressCallback] = None,
+        skip_ids: AbstractSet[str] = frozenset(),
+        failed_ids: Optional[Set[str]] = None,
     ) -> BackupResult:
         """Internal method to backup messages.
 
+        For incremental backups, the IDs of messages written to the MBOX file
+        are logged to a sibling .ids file, one per line, so later incremental
+        runs can skip them.
+
         Args:
             user_id: User email address
             query: Gmail query string
             max_results: Maximum number of messages
             backup_type: Type of backup ('incremental' or 'full')
+            progress_callback: Optional callable invoked as (done, listed)
+            skip_ids: IDs of messages already backed up, not fetched again
+            failed_ids: Optional set that receives the IDs of messages that
+                failed to download or write
 
         Returns:
             BackupResult object
@@ -182,73 +231,76 @@ class GmailBackup:
         backup_filename = f"gmail_backup_{backup_type}_{timestamp}.mbox"
         backup_path = self.backup_folder / backup_filename
         
-        message_ids = []
-        page_token = None
+        messages_processed = 0
+        messages_failed = 0
+        messages_skipped = 0
+        messages_done = 0
+        messages_listed = 0
         
-        # Collect all message IDs
-        while len(message_ids) < max_results:
-            list_result = self.api.list_messages(
-                user_id=user_id,
-                query=query,
-                max_results=min(100, max_results - len(message_ids)),
-                page_token=page_token,
-            )
-            
-            messages = list_result.get("messages", [])
-            if not messages:
-                break
-            
-            message_ids.extend([msg["id"] for msg in messages])
-            page_token = list_result.get("nextPageToken")
-            
-            if not page_token:
-                break
+        def new_ids(id_batches: Iterable[List[str]]) -> Iterator[List[str]]:
+            nonlocal messages_listed, messages_skipped
+            for batch in id_batches:
+                new_batch = [msg_id for msg_id in batch if msg_id not in skip_ids]
+                messages_skipped += len(batch) - len(new_batch)
+                messages_listed += len(new_batch)
+                if new_batch:
+                    yield new_batch
         
-        # Limit to max_results
-        message_ids = message_ids[:max_results]
+        # Batches of IDs are produced as listing pages arrive
+        batches = new_ids(self.api.iter_message_id_batches(
+            user_id=user_id,
+            query=query,
+            max_results=max_results,
+            batch_size=self.BATCH_SIZE,
+        ))
+        first_batch = next(batches, None)
         
-        if not message_ids:
+        if first_batch is None:
+            # Nothing new to write, so no MBOX file is created
             return BackupResult(
                 success=True,
                 message_count=0,
-                backup_path=str(backup_path),
+                backup_path="",
                 start_time=datetime.now(),
+                messages_skipped=messages_skipped,
             )
         
-        # Process messages in batches
-        messages_processed = 0
-        messages_failed = 0
-        
-        with MBOXGenerator(str(backup_path)) as mbox:
-            batch_size = 100
-            
-            for i in range(0, len(message_ids), batch_size):
-                batch = message_ids[i:i + batch_size]
+        # Pipeline: workers fetch batches while this thread lists the next page
+        # and writes finished batches in order (MBOX appends are not thread-safe)
+        # Only incremental state refers to .ids files, so full backups skip them
+        if backup_type == "incremental":
+            id_log_file = open(backup_path.with_suffix(".ids"), "a", encoding="ascii")
+        else:
+            id_log_file = nullcontext()
+        with MBOXGenerator(str(backup_path)) as mbox, id_log_file as id_log:
+            for batch, messages in self.api.fetch_batches(
+                chain([first_batch], batches),
+                user_id=user_id,
+                format="raw",  # Use raw format - MBOXGenerator handles it directly
+                workers=self.FETCH_WORKERS,
+            ):
+                # Messages missing from the response failed to download
+                messages = messages or []
+                messages_failed += len(batch) - len(messages)
+                if failed_ids is not None and len(messages) < len(batch):
+                    failed_ids.update(set(batch).difference(message["id"] for message in messages))
+                
+                for message in messages:
+                    try:
+                        mbox.add_message(message)  # Pass raw message directly
+                        if id_log is not None:
+                            id_log.write(f"{message['id']}\n")
+                        messages_processed += 1
+                    except Exception as e:
+                        messages_failed += 1
+                        if failed_ids is not None:
+                            failed_ids.add(message["id"])
+                        import logging
+                        logging.warning(f"Failed to process message {message.get('id', 'unknown')}: {e}")
                 
-                # Get messages in batch (use "full" format for parsing)
-                try:
-                    messages = self.api.batch_get_messages(
-                        user_id=user_id,
-                        message_ids=batch,
-                        format="raw",  # Use raw format - MBOXGenerator handles it directly
-                    )
-                    
-                    # Add messages directly to MBOX (MBOXGenerator handles raw format)
-                    for message in messages:
-                        try:
-                            mbox.add_message(message)  # Pass raw message directly
-                            messages_processed += 1
-                        except Exception as e:
-                            messages_failed += 1
-                            import logging
-                            logging.warning(f"Failed to process message {message.get('id', 'unknown')}: {e}")
-                            # Continue with next message
-                            continue
-                            
-                except Exception as e:
-                    messages_failed += len(batch)
-                    # Continue with next batch
-                    continue
+                messages_done += len(batch)
+                if progress_callback:
+                    progress_callback(messages_done, messages_listed)
         
         return BackupResult(
             success=True,
@@ -257,6 +309,7 @@ class GmailBackup:
             start_time=datetime.now(),
             messages_processed=messages_processed,
             messages_failed=messages_failed,
+            messages_skipped=messages_skipped,
         )
 
     def _get_last_backup_time(self, user_id: str) -> Optional[datetime]:
@@ -268,42 +321,117 @@ class GmailBackup:
         Returns:
             datetime of last backup or None
         """
-        if not self.state_file.exists():
-            return None
-        
-        try:
-            with open(self.state_file, "r") as f:
-                state = json.load(f)
-                user_state = state.get(user_id, {})
-                last_backup_str = user_state.get("last_backup_time")
-                if last_backup_str:
-                    return datetime.fromisoformat(last_backup_str)
-        except Exception:
-            pass
+        last_backup_str = self._load_state().get(user_id, {}).get("last_backup_time")
+        if last_backup_str:
+            try:
+                return datetime.fromisoformat(last_backup_str)
+            except ValueError:
+                pass
         
         return None
 
-    def _update_backup_state(self, user_id: str, backup_time: datetime) -> None:
+    def _update_backup_state(
+        self,
+        user_id: str,
+        backup_time: datetime,
+        id_log: Optional[str] = None,
+        failed_ids: AbstractSet[str] = frozenset(),
+    ) -> None:
         """Update backup state file.
 
+        last_backup_time only moves to backup_time when no failed message is
+        still being retried. A message that fails in MAX_FAILED_RUNS
+        consecutive runs is given up on so it cannot hold the cursor forever.
+
         Args:
             user_id: User email address
             backup_time: Time of backup
+            id_log: File name of the run's .ids log, if it backed up any messages
+            failed_ids: IDs of messages that failed in this run
         """
-        state = {}
-        if self.state_file.exists():
-            try:
-                with open(self.state_file, "r") as f:
-                    state = json.load(f)
-            except Exception:
-                pass
+        state = dict(self._load_state())
+        user_state = dict(state.get(user_id, {}))
         
-        if user_id not in state:
-            state[user_id] = {}
+        # Count consecutive failing runs per message; messages that succeeded
+        # or were not listed this time are dropped
+        failed_runs = user_state.get("failed_ids", {})
+        retrying = {}
+        for msg_id in failed_ids:
+            runs = failed_runs.get(msg_id, 0) + 1
+            if runs < self.MAX_FAILED_RUNS:
+                retrying[msg_id] = runs
+            else:
+                import logging
+                logging.warning(f"Giving up on message {msg_id} after {runs} failed backups")
+        user_state["failed_ids"] = retrying
         
-        state[user_id]["last_backup_time"] = backup_time.isoformat()
-        state[user_id]["last_backup_type"] = "incremental"
+        if not retrying:
+            user_state["last_backup_time"] = backup_time.isoformat()
+            user_state["last_backup_type"] = "incremental"
         
-        with open(self.state_file, "w") as f:
-            json.dump(state, f, indent=2)
+        id_logs = list(user_state.get("id_logs", ()))
+        if id_log:
+            id_logs.append({"time": backup_time.isoformat(), "file": id_log})
+        # Keep only logs of runs that the next "after:" query can overlap
+        # (the query has day granularity)
+        cursor = user_state.get("last_backup_time")
+        if cursor:
+            cutoff = datetime.fromisoformat(cursor) - timedelta(days=1)
+            id_logs = [entry for entry in id_logs if datetime.fromisoformat(entry["time"]) >= cutoff]
+        user_state["id_logs"] = id_logs
+        state[user_id] = user_state
+        
+        self._save_state(state)
+
+    def _load_backed_up_ids(self, user_id: str) -> Set[str]:
+        """Load IDs of messages saved by runs the next incremental query overlaps.
+
+        Args:
+            user_id: User email address
+
+        Returns:
+            Set of Gmail message IDs
+        """
+        backed_up_ids: Set[str] = set()
+        for entry in self._load_state().get(user_id, {}).get("id_logs", ()):
+            id_log = self.backup_folder / entry["file"]
+            # A deleted backup no longer counts: its messages are fetched again
+            if not id_log.with_suffix(".mbox").exists():
+                continue
+            try:
+                backed_up_ids.update(id_log.read_text(encoding="ascii").split())
+            except OSError:
+                continue
+        return backed_up_ids
 
+    def _load_state(self) -> Dict[str, Any]:
+        """Load the backup state, re-reading the file only when it changed.
+
+        Returns:
+            State dictionary keyed by user ID (do not mutate)
+        """
+        try:
+            mtime_ns = self.state_file.stat().st_mtime_ns
+        except OSError:
+            return {}
+        
+        if self._state_cache is not None and self._state_cache[0] == mtime_ns:
+            return self._state_cache[1]
+        
+        try:
+            state = json_codec.loads(self.state_file.read_bytes())
+        except Exception:
+            state = {}
+        self._state_cache = (mtime_ns, state)
+        return state
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        """Write the backup state atomically and keep it cached.
+
+        Args:
+            state: State dictionary keyed by user ID
+        """
+        tmp_file = self.state_file.with_suffix(".json.tmp")
+        tmp_file.write_bytes(json_codec.dumps_bytes(state))
+        os.replace(tmp_file, self.state_file)
+        self._state_cache = (self.state_file.stat().st_mtime_ns, state)
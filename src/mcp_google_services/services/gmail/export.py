@@ -1,14 +1,16 @@
 """Gmail export operations in multiple formats."""
 
-import json
 import csv
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
 from datetime import datetime
 
 from .api import GmailAPI
 from .parser import EmailParser
 from .mbox import MBOXGenerator
+from ...utils import json_codec
 
 
 class GmailExporter:
@@ -16,6 +18,20 @@ class GmailExporter:
 
     SUPPORTED_FORMATS = ["mbox", "json", "eml", "csv"]
 
+    # CSV export columns
+    CSV_FIELDS = (
+        "id", "thread_id", "date", "from", "to", "subject", "snippet",
+        "label_ids", "size_estimate", "has_attachments", "attachment_count",
+    )
+
+    # Threads writing EML files
+    EML_WRITE_WORKERS = 8
+
+    # Message IDs fetched per batch_get_messages call
+    BATCH_SIZE = 100
+    # Batches fetched concurrently while earlier messages are written
+    FETCH_WORKERS = 4
+
     def __init__(self, api: GmailAPI):
         """Initialize GmailExporter.
 
@@ -61,47 +77,19 @@ class GmailExporter:
             output_path = export_folder / f"gmail_export_{timestamp}.{format}"
 
         output_path = Path(output_path)
+        
+        # MBOX only needs the RFC 822 bytes, which "raw" returns as-is; the
+        # other formats need the parsed headers/body from "full"
+        fetch_format = "raw" if format == "mbox" else "full"
 
-        # Get messages
-        if message_ids:
-            messages = self.api.batch_get_messages(
-                user_id=user_id,
-                message_ids=message_ids,
-                format="full",
-            )
-        else:
-            # List messages
-            all_message_ids = []
-            page_token = None
-            
-            while len(all_message_ids) < max_results:
-                list_result = self.api.list_messages(
-                    user_id=user_id,
-                    query=query,
-                    max_results=min(100, max_results - len(all_message_ids)),
-                    page_token=page_token,
-                )
-                
-                messages = list_result.get("messages", [])
-                if not messages:
-                    break
-                
-                all_message_ids.extend([msg["id"] for msg in messages])
-                page_token = list_result.get("nextPageToken")
-                
-                if not page_token:
-                    break
-            
-            # Get full messages
-            all_message_ids = all_message_ids[:max_results]
-            if all_message_ids:
-                messages = self.api.batch_get_messages(
-                    user_id=user_id,
-                    message_ids=all_message_ids,
-                    format="full",
-                )
-            else:
-                messages = []
+        # Messages are fetched batch by batch while the writer consumes them
+        messages = self._iter_messages(
+            user_id=user_id,
+            query=query,
+            max_results=max_results,
+            message_ids=message_ids,
+            format=fetch_format,
+        )
 
         # Export based on format
         if format == "mbox":
@@ -113,11 +101,49 @@ class GmailExporter:
         elif format == "csv":
             return self._export_to_csv(messages, output_path)
 
-    def _export_to_mbox(self, messages: List[Dict[str, Any]], output_path: Path) -> Dict[str, Any]:
+    def _iter_messages(
+        self,
+        user_id: str,
+        query: Optional[str],
+        max_results: int,
+        message_ids: Optional[List[str]],
+        format: str,
+    ) -> Iterator[Dict[str, Any]]:
+        """Fetch messages lazily, listing and fetching batches concurrently.
+
+        Args:
+            user_id: User email address or 'me'
+            query: Optional Gmail query string (ignored if message_ids given)
+            max_results: Maximum number of messages to list
+            message_ids: Optional list of specific message IDs
+            format: Message format to fetch ('full' or 'raw')
+
+        Yields:
+            Gmail API message objects, in listing order
+        """
+        if message_ids:
+            id_batches = (
+                message_ids[i:i + self.BATCH_SIZE]
+                for i in range(0, len(message_ids), self.BATCH_SIZE)
+            )
+        else:
+            id_batches = self.api.iter_message_id_batches(
+                user_id=user_id,
+                query=query,
+                max_results=max_results,
+                batch_size=self.BATCH_SIZE,
+            )
+        
+        for _, messages in self.api.fetch_batches(
+            id_batches, user_id=user_id, format=format, workers=self.FETCH_WORKERS
+        ):
+            yield from messages or ()
+
+    def _export_to_mbox(self, messages: Iterable[Dict[str, Any]], output_path: Path) -> Dict[str, Any]:
         """Export messages to MBOX format.
 
         Args:
-            messages: List of Gmail API message objects
+            messages: Gmail API message objects (consumed lazily)
             output_path: Path to output MBOX file
 
         Returns:
@@ -128,8 +154,8 @@ class GmailExporter:
         with MBOXGenerator(str(output_path)) as mbox:
             for message in messages:
                 try:
-                    parsed = self.parser.parse_message(message)
-                    mbox.add_message(parsed)
+                    # Raw-format messages are written as-is; no need to parse them
+                    mbox.add_message(message if message.get("raw") else self.parser.parse_message(message))
                     message_count += 1
                 except Exception:
                     # Skip messages that fail to parse
@@ -142,44 +168,52 @@ class GmailExporter:
             "file_size": output_path.stat().st_size if output_path.exists() else 0,
         }
 
-    def _export_to_json(self, messages: List[Dict[str, Any]], output_path: Path) -> Dict[str, Any]:
+    def _export_to_json(self, messages: Iterable[Dict[str, Any]], output_path: Path) -> Dict[str, Any]:
         """Export messages to JSON format.
 
         Args:
-            messages: List of Gmail API message objects
+            messages: Gmail API message objects (consumed lazily)
             output_path: Path to output JSON file
 
         Returns:
             Export result dictionary
         """
-        parsed_messages = []
-        
-        for message in messages:
-            try:
-                parsed = self.parser.parse_message(message)
-                parsed_messages.append(parsed)
-            except Exception:
-                # Skip messages that fail to parse
-                continue
+        message_count = 0
         
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(parsed_messages, f, indent=2, default=str)
+        # Stream the array one message per line instead of building the whole
+        # document in memory first
+        with open(output_path, "wb") as f:
+            f.write(b"[")
+            for message in messages:
+                try:
+                    parsed = self.parser.parse_message(message)
+                    encoded = json_codec.dumps_bytes(parsed, default=str)
+                except Exception:
+                    # Skip messages that fail to parse
+                    continue
+                f.write(b",\n" if message_count else b"\n")
+                f.write(encoded)
+                message_count += 1
+            f.write(b"\n]\n")
         
         return {
             "format": "json",
             "output_path": str(output_path),
-            "message_count": len(parsed_messages),
+            "message_count": message_count,
             "file_size": output_path.stat().st_size if output_path.exists() else 0,
         }
 
-    def _export_to_eml(self, messages: List[Dict[str, Any]], output_path: Path) -> Dict[str, Any]:
+    def _export_to_eml(self, messages: Iterable[Dict[str, Any]], output_path: Path) -> Dict[str, Any]:
         """Export messages to individual EML files.
 
+        Files are written as <output_dir>/<first two characters of the
+        message ID>/<message ID>.eml.
+
         Args:
-            messages: List of Gmail API message objects
+            messages: Gmail API message objects (consumed lazily)
             output_path: Path to output directory (will create EML files inside)
 
         Returns:
@@ -195,24 +229,49 @@ class GmailExporter:
         output_dir.mkdir(parents=True, exist_ok=True)
         
         message_count = 0
+        submitted = 0
+        # Shard files into subdirectories by ID prefix so no single directory
+        # grows to thousands of entries (file creation slows as it grows)
+        shard_dirs = set()
         
-        for message in messages:
+        def collect(future: Future) -> None:
+            nonlocal message_count
             try:
-                parsed = self.parser.parse_message(message)
-                
-                # Generate filename from message ID
-                message_id = parsed.get("id", f"message_{message_count}")
-                eml_path = output_dir / f"{message_id}.eml"
-                
-                # Write RFC 822 format
-                rfc822_bytes = self.parser.to_rfc822(parsed)
-                with open(eml_path, "wb") as f:
-                    f.write(rfc822_bytes)
-                
+                future.result()
                 message_count += 1
-            except Exception:
-                # Skip messages that fail to parse
-                continue
+            except OSError as e:
+                import logging
+                logging.warning(f"Failed to write EML file: {e}")
+        
+        # File writes run on worker threads, overlapping with parsing the
+        # next messages; the window bounds how many encoded messages wait
+        pending: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=self.EML_WRITE_WORKERS) as executor:
+            for message in messages:
+                try:
+                    parsed = self.parser.parse_message(message)
+                    
+                    # Generate filename from message ID
+                    message_id = parsed.get("id", f"message_{submitted}")
+                    shard_dir = output_dir / message_id[:2]
+                    if shard_dir not in shard_dirs:
+                        shard_dir.mkdir(exist_ok=True)
+                        shard_dirs.add(shard_dir)
+                    eml_path = shard_dir / f"{message_id}.eml"
+                    
+                    # Write RFC 822 format
+                    rfc822_bytes = self.parser.to_rfc822(parsed)
+                except Exception:
+                    # Skip messages that fail to parse
+                    continue
+                
+                pending.append(executor.submit(eml_path.write_bytes, rfc822_bytes))
+                submitted += 1
+                if len(pending) >= self.EML_WRITE_WORKERS * 4:
+                    collect(pending.popleft())
+            
+            while pending:
+                collect(pending.popleft())
         
         return {
             "format": "eml",
@@ -221,11 +280,11 @@ class GmailExporter:
             "file_count": message_count,
         }
 
-    def _export_to_csv(self, messages: List[Dict[str, Any]], output_path: Path) -> Dict[str, Any]:
+    def _export_to_csv(self, messages: Iterable[Dict[str, Any]], output_path: Path) -> Dict[str, Any]:
         """Export messages to CSV format.
 
         Args:
-            messages: List of Gmail API message objects
+            messages: Gmail API message objects (consumed lazily)
             output_path: Path to output CSV file
 
         Returns:
@@ -234,42 +293,46 @@ class GmailExporter:
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        rows = []
+        message_count = 0
+        f = None
         
-        for message in messages:
-            try:
-                parsed = self.parser.parse_message(message)
+        try:
+            for message in messages:
+                try:
+                    parsed = self.parser.parse_message(message)
+                    attachments = parsed.get("attachments", ())
+                    row = (
+                        parsed.get("id", ""),
+                        parsed.get("thread_id", ""),
+                        parsed.get("date", ""),
+                        parsed.get("from", ""),
+                        parsed.get("to", ""),
+                        parsed.get("subject", ""),
+                        parsed.get("snippet", ""),
+                        ",".join(parsed.get("label_ids", [])),
+                        parsed.get("size_estimate", 0),
+                        len(attachments) > 0,
+                        len(attachments),
+                    )
+                except Exception:
+                    # Skip messages that fail to parse
+                    continue
                 
-                row = {
-                    "id": parsed.get("id", ""),
-                    "thread_id": parsed.get("thread_id", ""),
-                    "date": parsed.get("date", ""),
-                    "from": parsed.get("from", ""),
-                    "to": parsed.get("to", ""),
-                    "subject": parsed.get("subject", ""),
-                    "snippet": parsed.get("snippet", ""),
-                    "label_ids": ",".join(parsed.get("label_ids", [])),
-                    "size_estimate": parsed.get("size_estimate", 0),
-                    "has_attachments": len(parsed.get("attachments", [])) > 0,
-                    "attachment_count": len(parsed.get("attachments", [])),
-                }
-                rows.append(row)
-            except Exception:
-                # Skip messages that fail to parse
-                continue
-        
-        # Write CSV
-        if rows:
-            fieldnames = rows[0].keys()
-            with open(output_path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(rows)
+                # Rows are streamed to the file; it is only created once there is one
+                if f is None:
+                    f = open(output_path, "w", newline="", encoding="utf-8")
+                    writer = csv.writer(f)
+                    writer.writerow(self.CSV_FIELDS)
+                writer.writerow(row)
+                message_count += 1
+        finally:
+            if f is not None:
+                f.close()
         
         return {
             "format": "csv",
             "output_path": str(output_path),
-            "message_count": len(rows),
+            "message_count": message_count,
             "file_size": output_path.stat().st_size if output_path.exists() else 0,
         }
 
@@ -1,15 +1,30 @@
 """MBOX format generation for email backup."""
 
+import base64
 import os
-import time
+import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
-from email.utils import formatdate, parsedate_to_datetime
+from email.parser import BytesHeaderParser
+from email.utils import format_datetime, formatdate, parsedate_to_datetime
+
+# Email address inside a header value such as "Name <email@example.com>"
+_EMAIL_RE = re.compile(r"[\w.-]+@[\w.-]+\.\w+")
+
+# Blank line ending the header block of an RFC 822 message
+_HEADER_END_RE = re.compile(rb"\r?\n\r?\n")
+
+_header_parser = BytesHeaderParser()
 
 
 class MBOXGenerator:
     """Generator for RFC 4155 compliant MBOX format files."""
 
+    # Write buffer size; large buffers turn many small message writes into
+    # few large write(2) calls
+    BUFFER_SIZE = 1024 * 1024
+
     def __init__(self, output_path: str, encoding: str = "utf-8"):
         """Initialize MBOXGenerator.
 
@@ -37,7 +52,7 @@ class MBOXGenerator:
     def open(self) -> None:
         """Open MBOX file for writing."""
         if self.file is None:
-            self.file = open(self.output_path, "ab")  # Append binary mode
+            self.file = open(self.output_path, "ab", buffering=self.BUFFER_SIZE)  # Append binary mode
             self.message_count = 0
 
     def close(self) -> None:
@@ -57,32 +72,31 @@ class MBOXGenerator:
 
         # If message has raw field, use it directly (from Gmail API raw format)
         if "raw" in message and message.get("raw"):
-            import base64
-            import email
             try:
                 # Decode raw message
                 raw_bytes = base64.urlsafe_b64decode(message["raw"])
                 
-                # Parse raw message to extract From header
+                # Parse only the header block to extract From header; the
+                # body is written as-is and never needs to be parsed
                 from_email = "unknown@unknown"
                 try:
-                    email_msg = email.message_from_bytes(raw_bytes)
-                    from_header = email_msg.get("From", "")
+                    header_end = _HEADER_END_RE.search(raw_bytes)
+                    headers = raw_bytes[:header_end.end()] if header_end else raw_bytes
+                    from_header = _header_parser.parsebytes(headers).get("From", "")
                     if from_header:
                         from_email = self._extract_email(from_header) or "unknown@unknown"
                 except Exception:
                     pass
                 
                 # Generate "From " separator line
-                from email.utils import formatdate
                 from_line = f"From {from_email}  {formatdate()}\n"
-                self.file.write(from_line.encode(self.encoding))
                 
-                # Write raw message content
-                self.file.write(raw_bytes)
-                if not raw_bytes.endswith(b"\n"):
-                    self.file.write(b"\n")
-                self.file.write(b"\n")  # Empty line separator
+                # Write separator line, raw message content and empty line separator
+                self.file.writelines((
+                    from_line.encode(self.encoding),
+                    raw_bytes,
+                    b"\n\n" if not raw_bytes.endswith(b"\n") else b"\n",
+                ))
                 
                 self.message_count += 1
                 return
@@ -95,13 +109,17 @@ class MBOXGenerator:
         # Fallback: use parsed message format
         # Generate "From " separator line (RFC 4155)
         from_line = self._format_from_line(message)
-        self.file.write(from_line.encode(self.encoding))
-        self.file.write(b"\n")
 
-        # Write message content
+        # Write separator line, message content and empty line separator in
+        # one call; the missing trailing newline is written separately rather
+        # than appended, which would copy the whole message
         message_bytes = self._format_message(message)
-        self.file.write(message_bytes)
-        self.file.write(b"\n")  # Final newline
+        self.file.writelines((
+            from_line.encode(self.encoding),
+            b"\n",
+            message_bytes,
+            b"\n" if message_bytes.endswith(b"\n") else b"\n\n",
+        ))
 
         self.message_count += 1
 
@@ -121,16 +139,14 @@ class MBOXGenerator:
         # Get date (use message date or current time)
         date = message.get("date")
         if date:
-            # Format date as epoch time
-            if isinstance(date, str):
-                try:
-                    date_obj = parsedate_to_datetime(date)
-                    date_str = formatdate(time.mktime(date_obj.timetuple()))
-                except Exception:
-                    date_str = formatdate()
-            else:
-                # Assume it's a datetime object
-                date_str = formatdate(time.mktime(date.timetuple()))
+            # Re-format the message date directly; naive datetimes are
+            # written as "-0000" (UTC, zone unknown)
+            try:
+                if isinstance(date, str):
+                    date = parsedate_to_datetime(date)
+                date_str = format_datetime(date)
+            except Exception:
+                date_str = formatdate()
         else:
             date_str = formatdate()
 
@@ -144,22 +160,20 @@ class MBOXGenerator:
             message: Parsed message dictionary
 
         Returns:
-            RFC 822 formatted message bytes
+            RFC 822 formatted message bytes (may lack a trailing newline)
         """
         from .parser import EmailParser
         
         # Convert to RFC 822 format
-        rfc822_bytes = EmailParser.to_rfc822(message)
-        
-        # Ensure message ends with newline
-        if not rfc822_bytes.endswith(b"\n"):
-            rfc822_bytes += b"\n"
-        
-        return rfc822_bytes
+        return EmailParser.to_rfc822(message)
 
-    def _extract_email(self, header_value: str) -> Optional[str]:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _extract_email(header_value: str) -> Optional[str]:
         """Extract email address from header value.
 
+        Cached because senders repeat heavily within a mailbox.
+
         Args:
             header_value: Header value (e.g., "Name <email@example.com>")
 
@@ -169,17 +183,8 @@ class MBOXGenerator:
         if not header_value:
             return None
 
-        # Try to extract email from common formats
-        import re
-        
-        # Pattern: email@domain.com or <email@domain.com>
-        email_pattern = r"[\w\.-]+@[\w\.-]+\.\w+"
-        match = re.search(email_pattern, header_value)
-        
-        if match:
-            return match.group(0)
-        
-        return None
+        match = _EMAIL_RE.search(header_value)
+        return match.group(0) if match else None
 
     def get_message_count(self) -> int:
         """Get number of messages written.
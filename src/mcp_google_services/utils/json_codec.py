@@ -0,0 +1,82 @@
+"""JSON encoding helpers with optional orjson acceleration.
+
+orjson is used when installed (``pip install mcp-google-services[speedups]``);
+otherwise these helpers fall back to the standard library ``json`` module.
+
+Both backends produce the same output for JSON-native values, for non-str
+dict keys (converted to strings) and for datetimes (passed to ``default``,
+as the json module does). They still differ for types orjson serializes
+natively but json does not (dataclasses, UUIDs, enums, numpy arrays; json
+passes these to ``default``) and for NaN/Infinity (orjson writes ``null``).
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on optional dependency
+    orjson = None
+else:
+    # Match the json module: datetimes go through ``default`` instead of
+    # orjson's native ISO format, and non-str keys are converted to strings
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def dumps_bytes(
+    obj: Any,
+    indent: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> bytes:
+    """Serialize an object to UTF-8 encoded JSON bytes.
+
+    Args:
+        obj: Object to serialize
+        indent: If True, pretty-print with 2-space indentation
+        default: Optional callable for objects that are not JSON serializable
+
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        option = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS
+        return orjson.dumps(obj, default=default, option=option)
+
+    if indent:
+        return json.dumps(obj, indent=2, default=default, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), default=default, ensure_ascii=False).encode("utf-8")
+
+
+def dumps(
+    obj: Any,
+    indent: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> str:
+    """Serialize an object to a JSON string.
+
+    Args:
+        obj: Object to serialize
+        indent: If True, pretty-print with 2-space indentation
+        default: Optional callable for objects that are not JSON serializable
+
+    Returns:
+        JSON document as str
+    """
+    return dumps_bytes(obj, indent=indent, default=default).decode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Deserialize a JSON document.
+
+    Args:
+        data: JSON document as str or bytes
+
+    Returns:
+        Deserialized object
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
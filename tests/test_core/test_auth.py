@@ -0,0 +1,265 @@
+"""Unit tests for AuthManager token storage and caching."""
+
+import os
+import threading
+
+import pytest
+from datetime import datetime, timedelta
+
+from google.auth.exceptions import RefreshError
+from google.oauth2.credentials import Credentials
+
+from mcp_google_services.core.auth import AuthManager
+from mcp_google_services.utils.config import Config
+
+
+@pytest.fixture
+def auth_manager(tmp_path, monkeypatch):
+    """Create an AuthManager with an isolated token store and no keyring."""
+    monkeypatch.setenv("PYTHON_KEYRING_BACKEND", "keyring.backends.fail.Keyring")
+    monkeypatch.setenv("AUTH_TOKEN_STORE", str(tmp_path / "tokens.json"))
+    monkeypatch.setenv("GOOGLE_APIS_CREDENTIALS_PATH", str(tmp_path / "credentials.json"))
+    return AuthManager(config=Config(config_path=tmp_path / "config.json"))
+
+
+def make_credentials(scopes=None, expired=False):
+    """Create Credentials with a fixed expiry."""
+    expiry = datetime.utcnow() + (timedelta(hours=-1) if expired else timedelta(hours=1))
+    return Credentials(
+        token="access-token",
+        refresh_token="refresh-token",
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id="client-id",
+        client_secret="client-secret",
+        scopes=scopes or AuthManager.GMAIL_SCOPES,
+        expiry=expiry,
+    )
+
+
+class TestTokenFileStore:
+    """Test per-user token files."""
+
+    def test_save_and_load_round_trip(self, auth_manager):
+        """Test token data written for a user can be read back."""
+        auth_manager._save_to_file("user@example.com", {"token": "abc"})
+
+        assert auth_manager._load_from_file("user@example.com") == {"token": "abc"}
+        assert auth_manager._load_from_file("other@example.com") is None
+
+    def test_users_are_stored_in_separate_files(self, auth_manager):
+        """Test each user gets a distinct token file."""
+        auth_manager._save_to_file("a@example.com", {"token": "a"})
+        auth_manager._save_to_file("b@example.com", {"token": "b"})
+
+        assert len(list(auth_manager.token_store_dir.glob("*.json"))) == 2
+
+    def test_delete_removes_only_that_user(self, auth_manager):
+        """Test deleting credentials leaves other users untouched."""
+        auth_manager._save_to_file("a@example.com", {"token": "a"})
+        auth_manager._save_to_file("b@example.com", {"token": "b"})
+
+        auth_manager._delete_credentials("a@example.com")
+
+        assert auth_manager._load_from_file("a@example.com") is None
+        assert auth_manager._load_from_file("b@example.com") == {"token": "b"}
+
+    def test_unchanged_file_is_not_reparsed(self, auth_manager, monkeypatch):
+        """Test a token file is parsed again only after it changes on disk."""
+        auth_manager._save_to_file("user@example.com", {"token": "abc"})
+        monkeypatch.setattr(
+            "mcp_google_services.core.auth.json_codec.loads",
+            lambda data: pytest.fail("file re-parsed"),
+        )
+
+        assert auth_manager._load_from_file("user@example.com") == {"token": "abc"}
+
+    def test_changed_file_is_reloaded(self, auth_manager):
+        """Test an externally rewritten token file is picked up."""
+        auth_manager._save_to_file("user@example.com", {"token": "abc"})
+        token_file = auth_manager._token_file_for("user@example.com")
+        token_file.write_text('{"token": "xyz"}')
+        os.utime(token_file, ns=(0, 0))
+
+        assert auth_manager._load_from_file("user@example.com") == {"token": "xyz"}
+
+    def test_legacy_token_file_is_migrated(self, tmp_path, monkeypatch):
+        """Test a shared tokens.json is split into per-user files on startup."""
+        monkeypatch.setenv("PYTHON_KEYRING_BACKEND", "keyring.backends.fail.Keyring")
+        legacy_path = tmp_path / "legacy" / "tokens.json"
+        legacy_path.parent.mkdir()
+        legacy_path.write_text('{"a@example.com": {"token": "a"}, "b@example.com": {"token": "b"}}')
+        monkeypatch.setenv("AUTH_TOKEN_STORE", str(legacy_path))
+
+        manager = AuthManager(config=Config(config_path=tmp_path / "config.json"))
+
+        assert manager._load_from_file("a@example.com") == {"token": "a"}
+        assert manager._load_from_file("b@example.com") == {"token": "b"}
+        assert list(legacy_path.parent.iterdir()) == [legacy_path.with_suffix("")]
+
+
+class TestCredentialCache:
+    """Test the in-process credentials cache."""
+
+    def test_saved_credentials_are_served_from_cache(self, auth_manager):
+        """Test get_credentials returns cached credentials without loading."""
+        credentials = make_credentials()
+        auth_manager._save_credentials("user@example.com", credentials)
+        auth_manager._load_credentials = lambda user_id: pytest.fail("cache miss")
+
+        assert auth_manager.get_credentials("user@example.com") is credentials
+
+    def test_expired_credentials_are_not_served(self, auth_manager):
+        """Test expired cached credentials are ignored."""
+        auth_manager._cache_credentials("user@example.com", make_credentials(expired=True))
+
+        assert auth_manager._get_cached_credentials("user@example.com", AuthManager._GMAIL_SCOPE_SET) is None
+
+    def test_readonly_grant_covers_metadata_scope(self, auth_manager):
+        """Test a gmail.readonly token satisfies a metadata-only request."""
+        credentials = make_credentials()
+        auth_manager._cache_credentials("user@example.com", credentials)
+
+        metadata_scopes = ["https://www.googleapis.com/auth/gmail.metadata"]
+        assert auth_manager.get_credentials("user@example.com", metadata_scopes) is credentials
+
+    def test_missing_scopes(self):
+        """Test scope checks for known, implied and unknown scopes."""
+        readonly = "https://www.googleapis.com/auth/gmail.readonly"
+        metadata = "https://www.googleapis.com/auth/gmail.metadata"
+        custom = "https://example.com/auth/custom"
+
+        assert AuthManager._missing_scopes(frozenset([metadata]), [readonly]) == set()
+        assert AuthManager._missing_scopes(frozenset([readonly]), [metadata]) == {readonly}
+        assert AuthManager._missing_scopes(frozenset([custom, readonly]), [readonly, custom]) == set()
+        assert AuthManager._missing_scopes(frozenset([custom]), None) == {custom}
+
+    def test_delete_evicts_cache(self, auth_manager):
+        """Test deleting credentials also clears the cache."""
+        auth_manager._save_credentials("user@example.com", make_credentials())
+
+        auth_manager._delete_credentials("user@example.com")
+
+        assert auth_manager._get_cached_credentials("user@example.com", AuthManager._GMAIL_SCOPE_SET) is None
+
+
+class TestPreemptiveRefresh:
+    """Test background refresh of tokens close to expiry."""
+
+    def test_expiring_token_is_refreshed_in_background(self, auth_manager, monkeypatch):
+        """Test a token still valid to google-auth but inside the window is refreshed in the background."""
+        credentials = make_credentials()
+        credentials.expiry = datetime.utcnow() + timedelta(minutes=8)
+        auth_manager._cache_credentials("user@example.com", credentials)
+        refreshed = threading.Event()
+        monkeypatch.setattr(
+            auth_manager, "_preemptive_refresh",
+            lambda user_id, creds: refreshed.set(),
+        )
+
+        assert auth_manager.get_credentials("user@example.com") is credentials
+        assert refreshed.wait(timeout=5)
+
+    def test_fresh_token_is_not_refreshed(self, auth_manager, monkeypatch):
+        """Test a token with plenty of lifetime left is not refreshed."""
+        auth_manager._cache_credentials("user@example.com", make_credentials())
+        monkeypatch.setattr(
+            auth_manager, "_preemptive_refresh",
+            lambda user_id, creds: pytest.fail("unexpected refresh"),
+        )
+
+        auth_manager.get_credentials("user@example.com")
+
+
+class TestKeyringAvailability:
+    """Test keyring short-circuiting on hosts without a backend."""
+
+    def test_unavailable_keyring_is_not_retried(self, auth_manager):
+        """Test keyring is skipped after the backend fails once."""
+        assert auth_manager._load_from_keyring("user@example.com") is None
+        assert auth_manager._keyring_ok is False
+
+        class UnreachableKeyring:
+            def get_password(self, service, user_id):
+                pytest.fail("keyring called again")
+
+        auth_manager.__dict__["_keyring"] = UnreachableKeyring()
+        assert auth_manager._load_from_keyring("user@example.com") is None
+
+    def test_keyring_round_trip(self, auth_manager):
+        """Test token data survives the keyring encoding, compressed or not."""
+        class MemoryKeyring:
+            def __init__(self):
+                self.values = {}
+
+            def get_password(self, service, user_id):
+                return self.values.get((service, user_id))
+
+            def set_password(self, service, user_id, value):
+                self.values[(service, user_id)] = value
+
+        auth_manager.__dict__["_keyring"] = MemoryKeyring()
+        small = {"token": "abc"}
+        large = {"scopes": AuthManager.GMAIL_SCOPES * 10}
+
+        auth_manager._save_to_keyring("small@example.com", small)
+        auth_manager._save_to_keyring("large@example.com", large)
+
+        assert auth_manager._load_from_keyring("small@example.com") == small
+        assert auth_manager._load_from_keyring("large@example.com") == large
+        assert auth_manager._keyring.values[(auth_manager.keyring_service, "large@example.com")].startswith("z1:")
+
+
+class TestSharedCredentials:
+    """Test one Credentials instance is shared and refreshed once per user."""
+
+    def test_concurrent_callers_share_one_refresh(self, auth_manager, tmp_path):
+        """Test concurrent callers refresh expired credentials once and share them."""
+        (tmp_path / "credentials.json").write_text("{}")
+        credentials = make_credentials(expired=True)
+        auth_manager._cache_credentials("user@example.com", credentials)
+        refresh_calls = []
+
+        def fake_refresh(request):
+            refresh_calls.append(request)
+            credentials.token = "new-token"
+            credentials.expiry = datetime.utcnow() + timedelta(hours=1)
+
+        credentials.refresh = fake_refresh
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(auth_manager.get_credentials("user@example.com")))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(refresh_calls) == 1
+        assert all(result is credentials for result in results)
+
+    def test_failed_refresh_evicts_shared_instance(self, auth_manager, tmp_path, monkeypatch):
+        """Test credentials whose refresh is rejected are dropped from the cache."""
+        (tmp_path / "credentials.json").write_text("{}")
+        credentials = make_credentials(expired=True)
+        auth_manager._cache_credentials("user@example.com", credentials)
+
+        def fake_refresh(request):
+            raise RefreshError("invalid_grant")
+
+        def fake_authenticate(user_id, scopes):
+            raise FileNotFoundError("re-authentication required")
+
+        credentials.refresh = fake_refresh
+        monkeypatch.setattr(auth_manager, "_authenticate_user", fake_authenticate)
+
+        with pytest.raises(FileNotFoundError):
+            auth_manager.get_credentials("user@example.com")
+        assert "user@example.com" not in auth_manager._cred_cache
+
+    def test_refresh_locks_are_not_kept(self, auth_manager):
+        """Test per-user refresh locks are released once no caller holds them."""
+        with auth_manager._refresh_lock_for("user@example.com"):
+            assert "user@example.com" in auth_manager._refresh_locks
+
+        assert "user@example.com" not in auth_manager._refresh_locks
@@ -0,0 +1,101 @@
+"""Unit tests for GoogleAPIClient request execution."""
+
+import pytest
+from google.oauth2.credentials import Credentials
+from googleapiclient.errors import HttpError
+from httplib2 import Response
+
+from mcp_google_services.core import client as client_module
+from mcp_google_services.core.client import GoogleAPIClient
+
+
+@pytest.fixture
+def api_client(monkeypatch):
+    """Create a Gmail GoogleAPIClient that never sleeps."""
+    monkeypatch.setattr(client_module.time, "sleep", lambda seconds: None)
+    return GoogleAPIClient(Credentials(token="token"), "gmail", "v1")
+
+
+def make_http_error(status, headers=None):
+    """Create an HttpError with the given status and response headers."""
+    response = Response({"status": status, **(headers or {})})
+    return HttpError(response, b"{}")
+
+
+class FakeRequest:
+    """Request whose execute() replays a list of outcomes."""
+
+    def __init__(self, outcomes):
+        self.outcomes = outcomes
+        self.calls = 0
+
+    def __call__(self):
+        return self
+
+    def execute(self):
+        outcome = self.outcomes[self.calls]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class TestExecuteRequest:
+    """Test retry behaviour of _execute_request."""
+
+    def test_transient_errors_are_retried(self, api_client):
+        """Test 429/503 responses are retried until the request succeeds."""
+        request = FakeRequest([make_http_error(429), make_http_error(503), {"ok": True}])
+
+        assert api_client._execute_request(request) == {"ok": True}
+        assert request.calls == 3
+
+    def test_gives_up_after_max_attempts(self, api_client):
+        """Test the last transient error is raised once attempts run out."""
+        request = FakeRequest([make_http_error(500)] * GoogleAPIClient.MAX_ATTEMPTS)
+
+        with pytest.raises(HttpError):
+            api_client._execute_request(request)
+        assert request.calls == GoogleAPIClient.MAX_ATTEMPTS
+
+    def test_client_errors_are_not_retried(self, api_client):
+        """Test non-transient errors are raised immediately."""
+        request = FakeRequest([make_http_error(404)])
+
+        with pytest.raises(HttpError):
+            api_client._execute_request(request)
+        assert request.calls == 1
+
+    def test_retry_after_header_is_honored(self, api_client):
+        """Test a Retry-After header longer than the backoff is used."""
+        error = make_http_error(429, {"retry-after": "7"})
+
+        assert 7 <= api_client._retry_delay(error, 0) < 7.2
+
+    def test_quota_cost_is_charged_per_call(self, api_client, monkeypatch):
+        """Test a per-call quota_cost is charged without changing the default."""
+        charged = []
+        monkeypatch.setattr(api_client.rate_limiter, "wait_if_needed", charged.append)
+
+        api_client._execute_request(FakeRequest([{}]), quota_cost=5)
+        api_client._execute_request(FakeRequest([{}]))
+
+        assert charged == [5, api_client.quota_cost]
+
+    def test_rate_limit_403_is_retried(self, api_client):
+        """Test a 403 with a rate limit reason is treated as transient."""
+        content = b'{"error": {"code": 403, "message": "Rate Limit Exceeded", "errors": [{"reason": "userRateLimitExceeded"}]}}'
+        request = FakeRequest([HttpError(Response({"status": 403}), content), {"ok": True}])
+
+        assert api_client._execute_request(request) == {"ok": True}
+        assert request.calls == 2
+
+    def test_server_errors_not_retried_when_opted_out(self, api_client):
+        """Test retry_server_errors=False raises 5xx at once but still retries 429."""
+        failing = FakeRequest([make_http_error(503)])
+        limited = FakeRequest([make_http_error(429), {"ok": True}])
+
+        with pytest.raises(HttpError):
+            api_client._execute_request(failing, retry_server_errors=False)
+        assert failing.calls == 1
+        assert api_client._execute_request(limited, retry_server_errors=False) == {"ok": True}
@@ -0,0 +1,92 @@
+"""Unit tests for RateLimiter."""
+
+import pytest
+
+from mcp_google_services.core import rate_limiter as rate_limiter_module
+from mcp_google_services.core.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    """Controllable replacement for the time module."""
+
+    def __init__(self):
+        self.now_ns = 1_000_000_000_000
+        self.slept = []
+
+    def monotonic_ns(self):
+        return self.now_ns
+
+    def advance(self, seconds):
+        self.now_ns += round(seconds * 1_000_000_000)
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.advance(seconds)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Patch the rate limiter's clock."""
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter_module, "time", fake)
+    return fake
+
+
+class TestRateLimiter:
+    """Test token bucket accounting."""
+
+    def test_requests_within_burst_do_not_wait(self, clock):
+        """Test calls within the burst size are not throttled."""
+        limiter = RateLimiter(quota_per_second=10)
+
+        for _ in range(10):
+            limiter.wait_if_needed(1)
+
+        assert clock.slept == []
+        assert limiter.get_current_quota() == 0
+
+    def test_fractional_second_refill(self, clock):
+        """Test quota accrues for sub-second intervals."""
+        limiter = RateLimiter(quota_per_second=10)
+        limiter.wait_if_needed(10)
+
+        clock.advance(0.5)
+
+        assert limiter.get_current_quota() == 5
+
+    def test_refill_is_capped_at_burst_size(self, clock):
+        """Test idle time never accrues more than the burst size."""
+        limiter = RateLimiter(quota_per_second=10, burst_size=20)
+
+        clock.advance(60)
+
+        assert limiter.get_current_quota() == 20
+
+    def test_throttled_callers_queue_behind_reserved_quota(self, clock):
+        """Test each throttled caller waits for the quota reserved before it."""
+        limiter = RateLimiter(quota_per_second=10)
+        limiter.wait_if_needed(10)
+        clock.sleep = lambda seconds: clock.slept.append(seconds)
+
+        limiter.wait_if_needed(5)
+        limiter.wait_if_needed(5)
+
+        assert clock.slept == pytest.approx([0.5, 1.0])
+
+    def test_wait_covers_only_the_deficit(self, clock):
+        """Test a throttled call sleeps just long enough and leaves no extra quota."""
+        limiter = RateLimiter(quota_per_second=10)
+        limiter.wait_if_needed(8)
+
+        limiter.wait_if_needed(5)
+
+        assert clock.slept == pytest.approx([0.3])
+        assert limiter.get_current_quota() == 0
+
+    def test_get_current_quota_does_not_take_the_lock(self, clock):
+        """Test reading the quota works while another caller holds the lock."""
+        limiter = RateLimiter(quota_per_second=10)
+        limiter.wait_if_needed(4)
+
+        with limiter.lock:
+            assert limiter.get_current_quota() == 6
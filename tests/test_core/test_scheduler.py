@@ -0,0 +1,52 @@
+"""Unit tests for Scheduler."""
+
+from datetime import datetime
+
+import pytest
+
+from mcp_google_services.core.scheduler import Scheduler
+from mcp_google_services.utils.config import Config
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    """Create an enabled Scheduler with an isolated config."""
+    scheduler = Scheduler(config=Config(config_path=tmp_path / "config.json"))
+    scheduler.enabled = True
+    return scheduler
+
+
+class TestScheduler:
+    """Test cron evaluation."""
+
+    def test_next_run_time(self, scheduler):
+        """Test the next fire time follows the given base time."""
+        assert scheduler.get_next_run_time("0 2 * * *", datetime(2024, 1, 1, 1, 0)) == datetime(2024, 1, 1, 2, 0)
+        assert scheduler.get_next_run_time("0 2 * * *", datetime(2024, 1, 1, 3, 0)) == datetime(2024, 1, 2, 2, 0)
+
+    def test_parsed_expression_is_reused(self, scheduler):
+        """Test an expression is parsed once and re-seeded for later lookups."""
+        scheduler.get_next_run_time("*/15 * * * *", datetime(2024, 1, 1, 0, 0))
+        cron = scheduler._cron_cache["*/15 * * * *"]
+
+        assert scheduler.get_next_run_time("*/15 * * * *", datetime(2024, 1, 1, 0, 20)) == datetime(2024, 1, 1, 0, 30)
+        assert scheduler._cron_cache["*/15 * * * *"] is cron
+
+    def test_is_time_to_run_after_last_run(self, scheduler):
+        """Test a job is due once its next fire time after last_run has passed."""
+        assert scheduler.is_time_to_run("0 2 * * *", datetime(2000, 1, 1))
+        assert not scheduler.is_time_to_run("0 2 * * *", datetime(2999, 1, 1))
+
+    def test_next_fire_time_is_cached_per_last_run(self, scheduler, monkeypatch):
+        """Test repeated checks for the same last_run skip cron evaluation."""
+        last_run = datetime(2999, 1, 1)
+        assert not scheduler.is_time_to_run("0 2 * * *", last_run)
+        monkeypatch.setattr(scheduler, "_fire_time", lambda *args, **kwargs: pytest.fail("recomputed"))
+
+        assert not scheduler.is_time_to_run("0 2 * * *", last_run)
+
+    def test_new_last_run_invalidates_cached_fire_time(self, scheduler):
+        """Test a different last_run recomputes the next fire time."""
+        assert not scheduler.is_time_to_run("0 2 * * *", datetime(2999, 1, 1))
+
+        assert scheduler.is_time_to_run("0 2 * * *", datetime(2000, 1, 1))
@@ -0,0 +1,182 @@
+"""Unit tests for GmailAPI request handling."""
+
+import threading
+import time
+
+import pytest
+from google.oauth2.credentials import Credentials
+from googleapiclient.errors import HttpError
+from httplib2 import Response
+
+from mcp_google_services.services.gmail import api as api_module
+from mcp_google_services.services.gmail.api import GmailAPI
+
+
+class FakeBatch:
+    """Stand-in for BatchHttpRequest that answers from a dict of messages."""
+
+    def __init__(self, callback, messages, executed):
+        self.callback = callback
+        self.messages = messages
+        self.executed = executed
+        self.request_ids = []
+
+    def add(self, request, request_id):
+        self.request_ids.append(request_id)
+
+    def execute(self):
+        self.executed.append(list(self.request_ids))
+        for request_id in self.request_ids:
+            if isinstance(self.messages.get(request_id), list):
+                # Replay one outcome per execution: an Exception or a message
+                outcome = self.messages[request_id].pop(0)
+                if isinstance(outcome, Exception):
+                    self.callback(request_id, None, outcome)
+                else:
+                    self.callback(request_id, outcome, None)
+            elif request_id in self.messages:
+                self.callback(request_id, self.messages[request_id], None)
+            else:
+                self.callback(request_id, None, Exception("not found"))
+
+
+@pytest.fixture
+def gmail_api():
+    """Create a GmailAPI client with dummy credentials."""
+    return GmailAPI(Credentials(token="token"))
+
+
+class TestBatchGetMessages:
+    """Test batch_get_messages over the HTTP batch endpoint."""
+
+    def test_messages_are_fetched_in_batches(self, gmail_api, monkeypatch):
+        """Test IDs are chunked into batches and results keep input order."""
+        messages = {str(i): {"id": str(i)} for i in range(5)}
+        executed = []
+        monkeypatch.setattr(GmailAPI, "BATCH_SIZE", 2)
+        monkeypatch.setattr(
+            gmail_api.service, "new_batch_http_request",
+            lambda callback: FakeBatch(callback, messages, executed),
+        )
+
+        result = gmail_api.batch_get_messages(message_ids=["4", "3", "2", "1", "0"])
+
+        assert executed == [["4", "3"], ["2", "1"], ["0"]]
+        assert [message["id"] for message in result] == ["4", "3", "2", "1", "0"]
+
+    def test_failed_messages_are_skipped(self, gmail_api, monkeypatch):
+        """Test per-message errors are dropped and duplicate IDs fetched once."""
+        executed = []
+        monkeypatch.setattr(
+            gmail_api.service, "new_batch_http_request",
+            lambda callback: FakeBatch(callback, {"a": {"id": "a"}}, executed),
+        )
+
+        result = gmail_api.batch_get_messages(message_ids=["a", "missing", "a"])
+
+        assert executed == [["a", "missing"]]
+        assert result == [{"id": "a"}, {"id": "a"}]
+
+    def test_accepts_generator_of_ids(self, gmail_api, monkeypatch):
+        """Test message IDs can be passed as a generator."""
+        executed = []
+        monkeypatch.setattr(
+            gmail_api.service, "new_batch_http_request",
+            lambda callback: FakeBatch(callback, {"a": {"id": "a"}, "b": {"id": "b"}}, executed),
+        )
+
+        result = gmail_api.batch_get_messages(message_ids=(msg_id for msg_id in "ab"))
+
+        assert result == [{"id": "a"}, {"id": "b"}]
+
+    def test_rate_limited_items_are_retried(self, gmail_api, monkeypatch):
+        """Test only rate-limited IDs are re-sent in a follow-up batch."""
+        executed = []
+        messages = {
+            "a": {"id": "a"},
+            "b": [HttpError(Response({"status": 429}), b"{}"), {"id": "b"}],
+            "c": [HttpError(Response({"status": 404}), b"{}")],
+        }
+        monkeypatch.setattr(api_module.time, "sleep", lambda seconds: None)
+        monkeypatch.setattr(
+            gmail_api.service, "new_batch_http_request",
+            lambda callback: FakeBatch(callback, messages, executed),
+        )
+
+        result = gmail_api.batch_get_messages(message_ids=["a", "b", "c"])
+
+        assert executed == [["a", "b", "c"], ["b"]]
+        assert result == [{"id": "a"}, {"id": "b"}]
+
+    def test_concurrent_batches_are_capped_across_clones(self, gmail_api, monkeypatch):
+        """Test parallel fetch workers share one per-user limit on batch calls."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        class SlowBatch(FakeBatch):
+            def execute(self):
+                with lock:
+                    active.append(1)
+                    peak.append(len(active))
+                time.sleep(0.02)
+                with lock:
+                    active.pop()
+                super().execute()
+
+        messages = {str(i): {"id": str(i)} for i in range(8)}
+        clone = gmail_api.clone()
+        assert clone._batch_slots is gmail_api._batch_slots
+        monkeypatch.setattr(
+            clone.service, "new_batch_http_request",
+            lambda callback: SlowBatch(callback, messages, []),
+        )
+        monkeypatch.setattr(clone, "clone", lambda: clone)
+
+        batches = list(clone.fetch_batches([[str(i)] for i in range(8)], workers=4))
+
+        assert [messages for _, messages in batches] == [[{"id": str(i)}] for i in range(8)]
+        assert max(peak) <= GmailAPI.MAX_CONCURRENT_BATCHES
+
+
+class TestIterMessages:
+    """Test lazy pagination in iter_messages."""
+
+    def test_pages_are_followed_lazily(self, gmail_api, monkeypatch):
+        """Test pages are requested on demand until nextPageToken is absent."""
+        pages = {
+            None: {"messages": [{"id": "1"}, {"id": "2"}], "nextPageToken": "p2"},
+            "p2": {"messages": [{"id": "3"}]},
+        }
+        requested = []
+
+        def fake_list_messages(page_token=None, **kwargs):
+            requested.append(page_token)
+            return pages[page_token]
+
+        monkeypatch.setattr(gmail_api, "list_messages", fake_list_messages)
+        messages = gmail_api.iter_messages(query="in:inbox")
+
+        assert next(messages) == {"id": "1"}
+        assert requested == [None]
+        assert [message["id"] for message in messages] == ["2", "3"]
+        assert requested == [None, "p2"]
+
+
+class TestSendMessage:
+    """Test send_message request handling."""
+
+    def test_server_error_is_not_retried(self, gmail_api, monkeypatch):
+        """Test a 503 on send is raised, since the message may already be sent."""
+        calls = []
+
+        class FailingSend:
+            def execute(self):
+                calls.append(1)
+                raise HttpError(Response({"status": 503}), b"{}")
+
+        monkeypatch.setattr(gmail_api, "_messages_send", lambda **kwargs: FailingSend())
+
+        with pytest.raises(HttpError):
+            gmail_api.send_message(to="to@example.com", subject="Hi", body="Body")
+        assert len(calls) == 1
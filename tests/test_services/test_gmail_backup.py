@@ -0,0 +1,212 @@
+"""Unit tests for GmailBackup."""
+
+import base64
+import os
+from datetime import datetime
+
+import pytest
+
+from mcp_google_services.services.gmail.api import GmailAPI
+from mcp_google_services.services.gmail.backup import GmailBackup
+from mcp_google_services.utils.config import Config
+
+
+def make_raw_message(message_id):
+    """Create a Gmail API message in raw format."""
+    rfc822 = f"From: sender@example.com\r\nSubject: {message_id}\r\n\r\nBody\r\n".encode()
+    return {"id": message_id, "raw": base64.urlsafe_b64encode(rfc822).decode()}
+
+
+class FakeGmailAPI:
+    """GmailAPI stand-in serving a fixed set of message IDs."""
+
+    iter_messages = GmailAPI.iter_messages
+    iter_message_id_batches = GmailAPI.iter_message_id_batches
+    fetch_batches = GmailAPI.fetch_batches
+
+    def __init__(self, message_ids):
+        self.message_ids = message_ids
+
+    def clone(self):
+        return self
+
+    def list_messages(self, user_id="me", query=None, max_results=100, page_token=None, label_ids=None):
+        start = int(page_token or 0)
+        page = self.message_ids[start:start + max_results]
+        response = {"messages": [{"id": msg_id} for msg_id in page]}
+        if start + max_results < len(self.message_ids):
+            response["nextPageToken"] = str(start + max_results)
+        return response
+
+    def batch_get_messages(self, user_id="me", message_ids=None, format="full"):
+        return [make_raw_message(msg_id) for msg_id in message_ids]
+
+
+@pytest.fixture
+def make_backup(tmp_path, monkeypatch):
+    """Create a GmailBackup writing into a temporary folder."""
+    monkeypatch.chdir(tmp_path)
+
+    def factory(message_ids):
+        return GmailBackup(FakeGmailAPI(message_ids), Config(config_path=tmp_path / "config.json"))
+
+    return factory
+
+
+class TestBackupProgress:
+    """Test progress reporting during backups."""
+
+    def test_progress_is_reported_per_batch(self, make_backup):
+        """Test the callback receives (done, total) after each batch."""
+        backup = make_backup([f"m{i}" for i in range(150)])
+        progress = []
+
+        result = backup.full_backup(
+            max_results=150,
+            progress_callback=lambda done, total: progress.append((done, total)),
+        )
+
+        assert result.success
+        assert result.messages_processed == 150
+        assert progress == [(100, 150), (150, 150)]
+
+
+class TestBackupPipeline:
+    """Test the list/fetch/write pipeline in _backup_messages."""
+
+    def test_messages_are_written_in_listing_order(self, make_backup):
+        """Test batches fetched concurrently are written in listing order."""
+        message_ids = [f"m{i}" for i in range(1000)]
+        backup = make_backup(message_ids)
+
+        result = backup.full_backup(max_results=950)
+
+        with open(result.backup_path, "rb") as f:
+            subjects = [line.split(b": ")[1].strip() for line in f if line.startswith(b"Subject:")]
+        assert subjects == [msg_id.encode() for msg_id in message_ids[:950]]
+
+    def test_failed_batch_is_counted(self, make_backup, monkeypatch):
+        """Test a batch whose fetch raises is counted as failed."""
+        backup = make_backup([f"m{i}" for i in range(150)])
+        fetch = backup.api.batch_get_messages
+
+        def flaky_fetch(user_id="me", message_ids=None, format="full"):
+            if "m0" in message_ids:
+                raise RuntimeError("batch failed")
+            return fetch(user_id=user_id, message_ids=message_ids, format=format)
+
+        monkeypatch.setattr(backup.api, "batch_get_messages", flaky_fetch)
+
+        result = backup.full_backup(max_results=150)
+
+        assert result.messages_processed == 50
+        assert result.messages_failed == 100
+
+    def test_empty_listing_creates_no_file(self, make_backup):
+        """Test no MBOX file is created when nothing matches."""
+        result = make_backup([]).full_backup(max_results=10)
+
+        assert result.message_count == 0
+        assert result.backup_path == ""
+        assert not list(os.scandir(make_backup([]).backup_folder))
+
+    def test_fully_skipped_run_reports_no_path(self, make_backup):
+        """Test a run where every message was already saved reports no backup file."""
+        backup = make_backup(["a", "b"])
+        backup.incremental_backup(max_results=10)
+
+        result = backup.incremental_backup(max_results=10)
+
+        assert result.success
+        assert result.messages_skipped == 2
+        assert result.backup_path == ""
+
+    def test_only_incremental_backups_log_ids(self, make_backup):
+        """Test the .ids message log is written for incremental backups only."""
+        backup = make_backup(["a", "b"])
+
+        full = backup.full_backup(max_results=10)
+        incremental = backup.incremental_backup(max_results=10)
+
+        assert not os.path.exists(os.path.splitext(full.backup_path)[0] + ".ids")
+        with open(os.path.splitext(incremental.backup_path)[0] + ".ids") as f:
+            assert f.read().split() == ["a", "b"]
+
+
+class TestBackupState:
+    """Test the cached backup state file."""
+
+    def test_state_round_trip(self, make_backup):
+        """Test the last backup time is persisted and read back."""
+        backup = make_backup([])
+        backup_time = datetime(2024, 1, 2, 3, 4, 5)
+
+        backup._update_backup_state("user@example.com", backup_time)
+
+        assert backup._get_last_backup_time("user@example.com") == backup_time
+        assert make_backup([])._get_last_backup_time("user@example.com") == backup_time
+        assert backup._get_last_backup_time("other@example.com") is None
+
+    def test_unchanged_state_is_not_reread(self, make_backup, monkeypatch):
+        """Test the state file is parsed again only after it changes on disk."""
+        backup = make_backup([])
+        backup._update_backup_state("user@example.com", datetime(2024, 1, 1))
+        monkeypatch.setattr(
+            "mcp_google_services.services.gmail.backup.json_codec.loads",
+            lambda data: pytest.fail("state re-parsed"),
+        )
+
+        assert backup._get_last_backup_time("user@example.com") == datetime(2024, 1, 1)
+
+
+class TestIncrementalDedup:
+    """Test incremental backups skip messages earlier runs saved."""
+
+    def test_second_run_skips_backed_up_messages(self, make_backup):
+        """Test messages listed again by the next run are not fetched again."""
+        backup = make_backup(["a", "b"])
+        assert backup.incremental_backup(max_results=10).messages_processed == 2
+
+        backup.api.message_ids = ["a", "b", "c"]
+        result = backup.incremental_backup(max_results=10)
+
+        assert result.messages_processed == 1
+        assert result.messages_skipped == 2
+
+    def test_failures_hold_the_cursor_until_given_up(self, make_backup, monkeypatch):
+        """Test a failing message holds last_backup_time back for MAX_FAILED_RUNS runs."""
+        backup = make_backup(["a", "b"])
+        fetch = backup.api.batch_get_messages
+        monkeypatch.setattr(
+            backup.api, "batch_get_messages",
+            lambda user_id="me", message_ids=None, format="full": fetch(
+                message_ids=[msg_id for msg_id in message_ids if msg_id != "b"], format=format
+            ),
+        )
+
+        for _ in range(GmailBackup.MAX_FAILED_RUNS - 1):
+            result = backup.incremental_backup(max_results=10)
+            assert result.messages_failed == 1
+            assert backup._get_last_backup_time("me") is None
+        assert backup._load_backed_up_ids("me") == {"a"}
+
+        backup.incremental_backup(max_results=10)
+
+        assert backup._get_last_backup_time("me") is not None
+        assert backup._load_state()["me"]["failed_ids"] == {}
+
+    def test_retried_message_clears_failure(self, make_backup, monkeypatch):
+        """Test a message that succeeds on retry lets the cursor advance."""
+        backup = make_backup(["a", "b"])
+        fetch = backup.api.batch_get_messages
+        monkeypatch.setattr(
+            backup.api, "batch_get_messages",
+            lambda user_id="me", message_ids=None, format="full": fetch(message_ids=["a"], format=format),
+        )
+        backup.incremental_backup(max_results=10)
+        monkeypatch.setattr(backup.api, "batch_get_messages", fetch)
+
+        result = backup.incremental_backup(max_results=10)
+
+        assert result.messages_processed == 1
+        assert backup._get_last_backup_time("me") is not None
@@ -0,0 +1,166 @@
+"""Unit tests for GmailExporter."""
+
+import base64
+import csv
+import json
+
+import pytest
+
+from mcp_google_services.services.gmail.api import GmailAPI
+from mcp_google_services.services.gmail.export import GmailExporter
+from mcp_google_services.utils import json_codec
+
+
+class FakeGmailAPI:
+    """GmailAPI stand-in that records the requested message format."""
+
+    iter_messages = GmailAPI.iter_messages
+    iter_message_id_batches = GmailAPI.iter_message_id_batches
+    fetch_batches = GmailAPI.fetch_batches
+
+    def __init__(self, message_count=0):
+        self.formats = []
+        self.message_ids = [f"m{i}" for i in range(message_count)]
+
+    def clone(self):
+        return self
+
+    def list_messages(self, user_id="me", query=None, max_results=100, page_token=None, label_ids=None):
+        start = int(page_token or 0)
+        response = {"messages": [{"id": msg_id} for msg_id in self.message_ids[start:start + max_results]]}
+        if start + max_results < len(self.message_ids):
+            response["nextPageToken"] = str(start + max_results)
+        return response
+
+    def batch_get_messages(self, user_id="me", message_ids=None, format="full"):
+        self.formats.append(format)
+        if format == "full":
+            return [
+                {
+                    "id": msg_id,
+                    "threadId": msg_id,
+                    "payload": {
+                        "mimeType": "text/plain",
+                        "headers": [
+                            {"name": "Subject", "value": "Hello"},
+                            {"name": "Date", "value": "Mon, 01 Jan 2024 10:00:00 +0000"},
+                        ],
+                        "body": {"data": base64.urlsafe_b64encode(b"Body").decode()},
+                    },
+                }
+                for msg_id in message_ids
+            ]
+        rfc822 = b"From: sender@example.com\r\nSubject: Hello\r\n\r\nBody\r\n"
+        return [
+            {"id": msg_id, "raw": base64.urlsafe_b64encode(rfc822).decode()}
+            for msg_id in message_ids
+        ]
+
+
+class TestExportToMbox:
+    """Test MBOX export."""
+
+    def test_mbox_export_uses_raw_messages(self, tmp_path):
+        """Test MBOX export fetches raw messages and writes them unparsed."""
+        api = FakeGmailAPI()
+        output_path = tmp_path / "export.mbox"
+
+        result = GmailExporter(api).export_messages(
+            output_path=str(output_path), format="mbox", message_ids=["a", "b"]
+        )
+
+        assert api.formats == ["raw"]
+        assert result["message_count"] == 2
+        assert output_path.read_bytes().count(b"Subject: Hello") == 2
+
+    def test_query_export_is_limited_to_max_results(self, tmp_path):
+        """Test listed messages are fetched across pages up to max_results."""
+        api = FakeGmailAPI(message_count=250)
+        output_path = tmp_path / "export.mbox"
+
+        result = GmailExporter(api).export_messages(
+            output_path=str(output_path), format="mbox", max_results=220
+        )
+
+        assert result["message_count"] == 220
+        assert api.formats == ["raw"] * 3
+
+
+class TestExportToJson:
+    """Test JSON export."""
+
+    def test_json_export_is_a_valid_array(self, tmp_path):
+        """Test streamed JSON output parses as one array of messages."""
+        output_path = tmp_path / "export.json"
+
+        result = GmailExporter(FakeGmailAPI()).export_messages(
+            output_path=str(output_path), format="json", message_ids=["a", "b"]
+        )
+
+        exported = json.loads(output_path.read_text())
+        assert result["message_count"] == 2
+        assert [message["id"] for message in exported] == ["a", "b"]
+        assert exported[0]["subject"] == "Hello"
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_json_export_date_format(self, tmp_path, monkeypatch, use_orjson):
+        """Test dates are written the same way with or without orjson."""
+        if not use_orjson:
+            monkeypatch.setattr(json_codec, "orjson", None)
+        elif json_codec.orjson is None:
+            pytest.skip("orjson not installed")
+        output_path = tmp_path / "export.json"
+
+        GmailExporter(FakeGmailAPI()).export_messages(
+            output_path=str(output_path), format="json", message_ids=["a"]
+        )
+
+        assert json.loads(output_path.read_text())[0]["date"] == "2024-01-01 10:00:00+00:00"
+
+    def test_empty_json_export(self, tmp_path):
+        """Test an export with no messages writes an empty array."""
+        output_path = tmp_path / "export.json"
+
+        GmailExporter(FakeGmailAPI()).export_messages(
+            output_path=str(output_path), format="json", query="none"
+        )
+
+        assert json.loads(output_path.read_text()) == []
+
+
+class TestExportToCsv:
+    """Test CSV export."""
+
+    def test_csv_export_writes_header_and_rows(self, tmp_path):
+        """Test each message becomes one row under the header."""
+        output_path = tmp_path / "export.csv"
+
+        result = GmailExporter(FakeGmailAPI()).export_messages(
+            output_path=str(output_path), format="csv", message_ids=["a", "b"]
+        )
+
+        with open(output_path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert result["message_count"] == 2
+        assert [row["id"] for row in rows] == ["a", "b"]
+        assert rows[0]["subject"] == "Hello"
+        assert rows[0]["has_attachments"] == "False"
+
+
+class TestExportToEml:
+    """Test EML export."""
+
+    def test_eml_export_writes_sharded_files(self, tmp_path):
+        """Test each message is written to a directory named by its ID prefix."""
+        api = FakeGmailAPI(message_count=40)
+        output_dir = tmp_path / "eml"
+
+        result = GmailExporter(api).export_messages(
+            output_path=str(output_dir), format="eml", query="all"
+        )
+
+        assert result["message_count"] == 40
+        assert sorted(path.name for path in output_dir.glob("*/*.eml")) == sorted(
+            f"m{i}.eml" for i in range(40)
+        )
+        assert (output_dir / "m1" / "m1.eml").read_bytes().endswith(b"\n\nBody\n")
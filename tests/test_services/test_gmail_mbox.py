@@ -0,0 +1,97 @@
+"""Unit tests for MBOXGenerator."""
+
+import base64
+import mailbox
+from datetime import datetime
+
+from mcp_google_services.services.gmail.mbox import MBOXGenerator
+
+
+def make_raw_message(body):
+    """Create a Gmail API message in raw format."""
+    rfc822 = b"From: Sender <sender@example.com>\r\nSubject: Hello\r\n\r\n" + body
+    return {"id": "1", "raw": base64.urlsafe_b64encode(rfc822).decode()}
+
+
+class TestAddMessage:
+    """Test writing messages to an MBOX file."""
+
+    def test_raw_messages_are_separated(self, tmp_path):
+        """Test raw messages get a From line and a blank separator line."""
+        output_path = tmp_path / "out.mbox"
+
+        with MBOXGenerator(str(output_path)) as mbox:
+            mbox.add_message(make_raw_message(b"First\r\n"))
+            mbox.add_message(make_raw_message(b"Second"))
+
+        content = output_path.read_bytes()
+        assert content.startswith(b"From sender@example.com  ")
+        assert b"First\r\n\nFrom sender@example.com  " in content
+        assert content.endswith(b"Second\n\n")
+        assert len(mailbox.mbox(str(output_path))) == 2
+
+    def test_raw_from_line_uses_sender_header(self, tmp_path):
+        """Test the separator line names the sender from the header block only."""
+        output_path = tmp_path / "out.mbox"
+        rfc822 = (
+            b"From: Alice <alice@example.com>\r\nSubject: Hi\r\n\r\n"
+            b"From: mallory@example.com\r\n"
+        )
+
+        with MBOXGenerator(str(output_path)) as mbox:
+            mbox.add_message({"raw": base64.urlsafe_b64encode(rfc822).decode()})
+
+        assert output_path.read_bytes().startswith(b"From alice@example.com  ")
+
+    def test_parsed_messages_are_separated(self, tmp_path, monkeypatch):
+        """Test parsed messages end with a blank line whether or not the body ends in a newline."""
+        output_path = tmp_path / "out.mbox"
+        bodies = iter([b"Subject: One\n\nFirst\n", b"Subject: Two\n\nSecond"])
+        monkeypatch.setattr(
+            "mcp_google_services.services.gmail.parser.EmailParser.to_rfc822",
+            lambda message: next(bodies),
+        )
+
+        with MBOXGenerator(str(output_path)) as mbox:
+            mbox.add_message({"from": "sender@example.com"})
+            mbox.add_message({"from": "sender@example.com"})
+
+        content = output_path.read_bytes()
+        assert b"First\n\nFrom sender@example.com  " in content
+        assert content.endswith(b"Second\n\n")
+        assert len(mailbox.mbox(str(output_path))) == 2
+
+
+class TestFormatFromLine:
+    """Test the RFC 4155 separator line."""
+
+    def test_message_date_is_used(self, tmp_path):
+        """Test the message date is kept with its original offset."""
+        mbox = MBOXGenerator(str(tmp_path / "out.mbox"))
+
+        from_line = mbox._format_from_line({
+            "from": "Sender <sender@example.com>",
+            "date": "Tue, 02 Jan 2024 12:30:00 +0200",
+        })
+
+        assert from_line == "From sender@example.com  Tue, 02 Jan 2024 12:30:00 +0200"
+
+    def test_datetime_and_invalid_dates(self, tmp_path):
+        """Test datetime values are formatted and unparseable dates fall back to now."""
+        mbox = MBOXGenerator(str(tmp_path / "out.mbox"))
+
+        assert mbox._format_from_line({"date": datetime(2024, 1, 2, 12, 30)}) == (
+            "From unknown@unknown  Tue, 02 Jan 2024 12:30:00 -0000"
+        )
+        assert mbox._format_from_line({"date": "not a date"}).startswith("From unknown@unknown  ")
+
+
+class TestExtractEmail:
+    """Test sender address extraction."""
+
+    def test_extract_email(self):
+        """Test addresses are found in display-name and bare forms."""
+        assert MBOXGenerator._extract_email("Jane Doe <jane.doe@example.co.uk>") == "jane.doe@example.co.uk"
+        assert MBOXGenerator._extract_email("bob@example.com") == "bob@example.com"
+        assert MBOXGenerator._extract_email("undisclosed-recipients") is None
+        assert MBOXGenerator._extract_email("") is None